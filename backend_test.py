@@ -34,24 +34,150 @@ Version: 2.0 - Pattern Recognition Focus
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import time
 import uuid
 import os
-from typing import Dict, List, Any, Tuple
+import re
+import gzip
+import functools
+import operator
+from typing import Dict, List, Any, Iterator, Optional, Tuple
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson                   # Fast JSON parsing for large classification payloads
+except ImportError:
+    orjson = None                   # Fall back to requests' stdlib-based decoder
+
+try:
+    import h2                       # Required by httpx for HTTP/2 support
+    import httpx                    # HTTP/2 client used to multiplex the endpoint probes
+except ImportError:
+    httpx = None                    # Fall back to one HTTP/1.1 connection per probe
+
+try:
+    import ijson                    # Incremental parsing of the classification response
+except ImportError:
+    ijson = None                    # Fall back to parsing the whole response body
+
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _json(response: requests.Response) -> Any:
+    """Decode a JSON response body, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+@functools.lru_cache(maxsize=4)
+def _load_ddl_payload(path: str, mtime: float) -> bytes:
+    """Read and gzip a DDL file; mtime is part of the key so edits invalidate the cache"""
+    with open(path, 'rb') as f:
+        return gzip.compress(f.read(), compresslevel=6)
+
+
+# Healthcare table patterns (should be HIPAA)
+_HEALTHCARE_TABLES = frozenset({
+    'patient_demographics_detailed', 'medical_patient_records', 
+    'clinical_trial_participants', 'behavioral_health_sessions'
+})
+
+# Non-healthcare table patterns (should NOT be HIPAA)
+_NON_HEALTHCARE_TABLES = frozenset({
+    'financial_accounts_advanced', 'bank_customer_profiles', 'cc_transaction_history',
+    'academic_records_detailed', 'student_enrollment_records', 
+    'employee_records_comprehensive', 'legal_entities_complex',
+    'customer_service_interactions', 'system_audit_logs', 'application_configuration'
+})
+
+# Medical columns that legitimately carry HIPAA inside the mixed insurance table
+_MIXED_MEDICAL_FIELDS = frozenset({'medical_provider', 'diagnosis_code', 'treatment_code'})
+
+# Single compiled alternation so each table name is scanned once, not once per pattern
+_HEALTHCARE_TABLE_RE = re.compile('|'.join(re.escape(table) for table in sorted(_HEALTHCARE_TABLES)))
+
+# Fields read from every classification result; results are normalized first so
+# the getter never raises on a missing key
+_get_fields = operator.itemgetter('table_name', 'column_name', 'applicable_regulations')
+
+
+def _normalize_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill in the keys read by _get_fields; backends report the column as field_name"""
+    result.setdefault('table_name', '')
+    if not result.get('column_name'):
+        result['column_name'] = result.get('field_name', '')
+    result.setdefault('applicable_regulations', [])
+    return result
+
+
+def _stream_field_analyses(response: requests.Response) -> Iterator[Dict[str, Any]]:
+    """Yield field analyses from a streamed /classify response as they are parsed"""
+    response.raw.decode_content = True
+    for key, value in ijson.kvitems(response.raw, 'results.field_analyses', use_float=True):
+        if isinstance(value, dict):
+            value['field_key'] = key  # Add the key for reference
+            yield value
+
+
+# Column-name patterns for the critical PII kinds from the accuracy report,
+# compiled once at import and reused for every classified field
+_PATTERNS = {
+    'SSN': re.compile(r'(?:^|_)(?:ssn|social_security(?:_number|_no)?)(?:_|$)', re.IGNORECASE),
+    'NAME': re.compile(r'(?:first|last|middle|full|customer|patient|employee)_name', re.IGNORECASE),
+    'PHONE': re.compile(r'phone|mobile|(?:^|_)fax(?:_|$)', re.IGNORECASE),
+    'EMAIL': re.compile(r'e_?mail', re.IGNORECASE),
+    'DOB': re.compile(r'date_of_birth|birth_date|(?:^|_)dob(?:_|$)', re.IGNORECASE),
+    'MRN': re.compile(r'medical_record|(?:^|_)mrn(?:_|$)', re.IGNORECASE),
+    'ACCOUNT': re.compile(r'account_(?:number|no|num)', re.IGNORECASE),
+}
+
+
+# All critical patterns combined into one alternation; the named group that
+# matched identifies the kind, so each column name is scanned only once
+_PII_UNION = re.compile(
+    '|'.join(f'(?P<{kind}>{pattern.pattern})' for kind, pattern in _PATTERNS.items()),
+    re.IGNORECASE
+)
+
+
+def _match_kind(value: str) -> Optional[str]:
+    """Return the first critical PII kind whose pattern matches the column name"""
+    match = _PII_UNION.search(value)
+    return match.lastgroup if match else None
+
 
 class PIIScannerBackendTester:
-    def __init__(self):
+    def __init__(self, fused: bool = False):
+        # Use the single /pipeline call instead of configure-scan + classify
+        self.fused = fused
+        
         # Get backend URL from frontend environment
         self.base_url = "https://pii-dashboard.preview.emergentagent.com"
         self.api_base = f"{self.base_url}/api"
         self.session = requests.Session()
+        
+        # Keep-alive pool sized for the concurrent probes, with retries on gateway errors
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=16,
+            max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.session.headers.update({
             'Content-Type': 'application/json',
             'Accept': 'application/json'
         })
         
+        # Tables returned by /extract-schema, reused by the classification step
+        self._tables_dict: Dict[str, List[Dict[str, Any]]] = {}
+        
         # Test results tracking
         self.test_results = {
             'health_check': False,
@@ -73,13 +199,20 @@ class PIIScannerBackendTester:
         print(f"🎯 API Base: {self.api_base}")
         print("=" * 60)
 
+    def _post_json(self, url: str, payload: Any, **kwargs) -> requests.Response:
+        """POST a JSON body, pre-serialized with orjson when it is installed"""
+        if orjson is None:
+            return self.session.post(url, json=payload, **kwargs)
+        # The session already sends Content-Type: application/json
+        return self.session.post(url, data=orjson.dumps(payload), **kwargs)
+
     def test_health_endpoint(self) -> bool:
         """Test the health check endpoint"""
         print("🏥 Testing Health Endpoint...")
         try:
             response = self.session.get(f"{self.api_base}/health", timeout=10)
             if response.status_code == 200:
-                health_data = response.json()
+                health_data = _json(response)
                 print(f"✅ Health Check: {health_data.get('status', 'Unknown')}")
                 self.test_results['health_check'] = True
                 return True
@@ -96,11 +229,10 @@ class PIIScannerBackendTester:
         """Test schema upload endpoint with comprehensive DDL"""
         print("📤 Testing Schema Upload Endpoint...")
         
-        # Load comprehensive test DDL
+        # Load comprehensive test DDL and gzip it; SQL text compresses well and the upload is network-bound
         ddl_path = "/app/test_data/comprehensive_multi_sector_ddl.sql"
         try:
-            with open(ddl_path, 'r') as f:
-                ddl_content = f.read()
+            ddl_payload = _load_ddl_payload(ddl_path, os.path.getmtime(ddl_path))
         except Exception as e:
             print(f"❌ Failed to load test DDL: {str(e)}")
             self.test_results['errors'].append(f"Failed to load test DDL: {str(e)}")
@@ -109,13 +241,13 @@ class PIIScannerBackendTester:
         try:
             # Prepare multipart form data
             files = {
-                'file': ('comprehensive_test.sql', ddl_content, 'text/plain')
+                'file': ('comprehensive_test.sql.gz', ddl_payload, 'application/gzip')
             }
             
-            # Remove Content-Type header for multipart upload
-            headers = {k: v for k, v in self.session.headers.items() if k.lower() != 'content-type'}
+            # Drop the session's JSON Content-Type so requests sets the multipart boundary
+            headers = {'Content-Type': None}
             
-            response = requests.post(
+            response = self.session.post(
                 f"{self.api_base}/upload-schema",
                 files=files,
                 headers=headers,
@@ -123,7 +255,7 @@ class PIIScannerBackendTester:
             )
             
             if response.status_code == 200:
-                upload_data = response.json()
+                upload_data = _json(response)
                 session_id = upload_data.get('session_id')
                 print(f"✅ Schema Upload Success: Session {session_id}")
                 self.test_results['api_endpoints']['upload_schema'] = True
@@ -142,53 +274,84 @@ class PIIScannerBackendTester:
             self.test_results['errors'].append(f"Schema upload error: {str(e)}")
             return False, ""
 
-    def test_extract_schema_endpoint(self, session_id: str) -> bool:
-        """Test schema extraction endpoint"""
+    def test_extract_schema_endpoint(self, session_id: str) -> Tuple[bool, Dict]:
+        """Test schema extraction endpoint and return the extracted tables"""
         print("🔍 Testing Schema Extraction Endpoint...")
         
         try:
-            response = self.session.post(
+            response = self._post_json(
                 f"{self.api_base}/extract-schema/{session_id}",
-                json={},
+                {},
                 timeout=30
             )
             
             if response.status_code == 200:
-                extract_data = response.json()
-                tables_count = len(extract_data.get('tables', []))
+                extract_data = _json(response)
+                self._tables_dict = extract_data.get('tables', {})
+                tables_count = len(self._tables_dict)
                 print(f"✅ Schema Extraction Success: {tables_count} tables extracted")
                 self.test_results['api_endpoints']['extract_schema'] = True
-                return True
+                return True, self._tables_dict
             else:
                 print(f"❌ Schema Extraction Failed: HTTP {response.status_code}")
                 self.test_results['api_endpoints']['extract_schema'] = False
                 self.test_results['errors'].append(f"Schema extraction failed: HTTP {response.status_code}")
-                return False
+                return False, {}
                 
         except Exception as e:
             print(f"❌ Schema Extraction Error: {str(e)}")
             self.test_results['api_endpoints']['extract_schema'] = False
             self.test_results['errors'].append(f"Schema extraction error: {str(e)}")
+            return False, {}
+
+    def test_fused_pipeline(self, session_id: str) -> bool:
+        """Run extract + configure + classify through the fused /pipeline endpoint"""
+        print("🎯 Testing Fused Classification Pipeline...")
+        
+        try:
+            response = self._post_json(
+                f"{self.api_base}/pipeline/{session_id}",
+                {"regulations": ["HIPAA", "GDPR", "CCPA"], "scan_type": "COMPREHENSIVE"},
+                timeout=120,
+                stream=True
+            )
+            
+            # Close the streamed body once analysed so the pooled connection is released
+            try:
+                if response.status_code != 200:
+                    print(f"❌ Fused Pipeline Failed: HTTP {response.status_code}")
+                    print(f"Response: {response.text}")
+                    self.test_results['api_endpoints']['classify'] = False
+                    self.test_results['errors'].append(f"Fused pipeline failed: HTTP {response.status_code}")
+                    return False
+            
+                print("✅ Fused Pipeline Success: streaming field analyses")
+                self.test_results['api_endpoints']['classify'] = True
+            
+                # One field analysis per NDJSON line, analyzed as the lines arrive
+                field_analyses = (_loads(line) for line in response.iter_lines() if line)
+                return self.analyze_classification_accuracy(
+                    {'results': {'field_analyses': field_analyses}}, session_id
+                )
+            finally:
+                response.close()
+                
+        except Exception as e:
+            print(f"❌ Fused Pipeline Error: {str(e)}")
+            self.test_results['api_endpoints']['classify'] = False
+            self.test_results['errors'].append(f"Fused pipeline error: {str(e)}")
             return False
 
     def test_classify_endpoint(self, session_id: str) -> bool:
         """Test classification endpoint and validate accuracy"""
+        if self.fused:
+            return self.test_fused_pipeline(session_id)
+        
         print("🎯 Testing Classification Endpoint...")
         
         try:
-            # First get the extracted tables to configure scan
-            extract_response = self.session.post(
-                f"{self.api_base}/extract-schema/{session_id}",
-                json={},
-                timeout=30
-            )
-            
-            if extract_response.status_code != 200:
-                print(f"❌ Failed to get tables for scan configuration")
-                return False
-            
-            extract_data = extract_response.json()
-            tables_dict = extract_data.get('tables', {})
+            # Reuse the tables from the extraction step instead of re-extracting
+            tables_dict = self._tables_dict
             tables = list(tables_dict.keys())  # Get table names from dictionary keys
             
             if not tables:
@@ -198,9 +361,9 @@ class PIIScannerBackendTester:
             print(f"📋 Found {len(tables)} tables for scanning")
             
             # Configure scan settings with proper format
-            config_response = self.session.post(
+            config_response = self._post_json(
                 f"{self.api_base}/configure-scan",
-                json={
+                {
                     "tables": tables,
                     "scan_type": "COMPREHENSIVE",
                     "custom_fields": []
@@ -228,30 +391,38 @@ class PIIScannerBackendTester:
             
             print(f"📊 Prepared {len(selected_fields)} fields for classification")
             
-            # Start classification
-            classify_response = self.session.post(
+            # Start classification; stream the body when ijson can parse it incrementally
+            classify_response = self._post_json(
                 f"{self.api_base}/classify",
-                json={
+                {
                     "session_id": session_id,
                     "selected_fields": selected_fields,
                     "regulations": ["HIPAA", "GDPR", "CCPA"]
                 },
-                timeout=120  # Extended timeout for classification
+                timeout=120,  # Extended timeout for classification
+                stream=ijson is not None
             )
             
-            if classify_response.status_code == 200:
-                classify_data = classify_response.json()
-                print(f"✅ Classification Success: {classify_data.get('message', 'Completed')}")
-                self.test_results['api_endpoints']['classify'] = True
+            # Close the streamed body once analysed so the pooled connection is released
+            try:
+                if classify_response.status_code == 200:
+                    if ijson is not None:
+                        classify_data = {'results': {'field_analyses': _stream_field_analyses(classify_response)}}
+                    else:
+                        classify_data = _json(classify_response)
+                    print(f"✅ Classification Success: {classify_data.get('message', 'Completed')}")
+                    self.test_results['api_endpoints']['classify'] = True
                 
-                # Analyze classification results for accuracy
-                return self.analyze_classification_accuracy(classify_data, session_id)
-            else:
-                print(f"❌ Classification Failed: HTTP {classify_response.status_code}")
-                print(f"Response: {classify_response.text}")
-                self.test_results['api_endpoints']['classify'] = False
-                self.test_results['errors'].append(f"Classification failed: HTTP {classify_response.status_code}")
-                return False
+                    # Analyze classification results for accuracy
+                    return self.analyze_classification_accuracy(classify_data, session_id)
+                else:
+                    print(f"❌ Classification Failed: HTTP {classify_response.status_code}")
+                    print(f"Response: {classify_response.text}")
+                    self.test_results['api_endpoints']['classify'] = False
+                    self.test_results['errors'].append(f"Classification failed: HTTP {classify_response.status_code}")
+                    return False
+            finally:
+                classify_response.close()
                 
         except Exception as e:
             print(f"❌ Classification Error: {str(e)}")
@@ -279,62 +450,60 @@ class PIIScannerBackendTester:
                         value['field_key'] = key  # Add the key for reference
                         results_list.append(value)
                 results = results_list
-            
-            if not results:
-                print("❌ No valid classification results found")
-                return False
+            results = map(_normalize_result, results)
             
             # Count classifications by regulation
             hipaa_count = 0
             gdpr_count = 0
             non_pii_count = 0
-            total_fields = len(results)
+            total_fields = 0
             
             # Track false HIPAA classifications
             false_hipaa_fields = []
             correct_hipaa_fields = []
             
-            # Healthcare table patterns (should be HIPAA)
-            healthcare_tables = {
-                'patient_demographics_detailed', 'medical_patient_records', 
-                'clinical_trial_participants', 'behavioral_health_sessions'
-            }
+            # Track detection of the critical PII patterns: kind -> [matched, sensitive]
+            critical_patterns = {kind: [0, 0] for kind in _PATTERNS}
             
-            # Non-healthcare table patterns (should NOT be HIPAA)
-            non_healthcare_tables = {
-                'financial_accounts_advanced', 'bank_customer_profiles', 'cc_transaction_history',
-                'academic_records_detailed', 'student_enrollment_records', 
-                'employee_records_comprehensive', 'legal_entities_complex',
-                'customer_service_interactions', 'system_audit_logs', 'application_configuration'
-            }
+            get_fields = _get_fields
+            lower = str.lower
             
+            # results may be a generator over a streamed response, so count while iterating
             for result in results:
-                table_name = result.get('table_name', '').lower()
-                column_name = result.get('column_name', '')
-                regulations = result.get('applicable_regulations', [])
+                total_fields += 1
+                table_name, column_name, regulations = get_fields(result)
+                table_name = lower(table_name)
+                
+                kind = _match_kind(column_name)
+                if kind:
+                    counts = critical_patterns[kind]
+                    counts[0] += 1
+                    counts[1] += bool(result.get('is_sensitive', False))
                 
-                # Check if HIPAA is in regulations
-                is_hipaa = 'HIPAA' in regulations
+                # Regulation flags are tallied as 0/1 increments instead of an if/elif ladder
+                regs = frozenset(regulations)
+                is_hipaa = 'HIPAA' in regs
+                is_gdpr = not is_hipaa and 'GDPR' in regs
+                hipaa_count += is_hipaa
+                gdpr_count += is_gdpr
+                non_pii_count += not (is_hipaa or is_gdpr)
                 
                 if is_hipaa:
-                    hipaa_count += 1
-                    
                     # Check if this is a false HIPAA classification
-                    is_healthcare_table = any(ht in table_name for ht in healthcare_tables)
+                    is_healthcare_table = _HEALTHCARE_TABLE_RE.search(table_name) is not None
                     is_medical_field_in_mixed_table = (
                         'insurance_claims_processing' in table_name and 
-                        column_name.lower() in ['medical_provider', 'diagnosis_code', 'treatment_code']
+                        lower(column_name) in _MIXED_MEDICAL_FIELDS
                     )
                     
                     if is_healthcare_table or is_medical_field_in_mixed_table:
                         correct_hipaa_fields.append(f"{table_name}.{column_name}")
                     else:
                         false_hipaa_fields.append(f"{table_name}.{column_name}")
-                
-                elif 'GDPR' in regulations:
-                    gdpr_count += 1
-                else:
-                    non_pii_count += 1
+            
+            if not total_fields:
+                print("❌ No valid classification results found")
+                return False
             
             # Calculate accuracy metrics
             false_hipaa_count = len(false_hipaa_fields)
@@ -351,6 +520,10 @@ class PIIScannerBackendTester:
                 'false_hipaa_fields': false_hipaa_count,
                 'gdpr_fields': gdpr_count,
                 'non_pii_fields': non_pii_count,
+                'critical_patterns': {
+                    kind: {'matched': matched, 'sensitive': sensitive}
+                    for kind, (matched, sensitive) in critical_patterns.items()
+                },
                 'accuracy_percentage': ((total_fields - false_hipaa_count) / total_fields) * 100 if total_fields > 0 else 0
             }
             
@@ -364,6 +537,10 @@ class PIIScannerBackendTester:
             print(f"   Non-PII Classifications: {non_pii_count}")
             print(f"   False HIPAA Rate: {false_hipaa_rate:.1f}%")
             print(f"   Overall Accuracy: {self.test_results['classification_accuracy']['accuracy_percentage']:.1f}%")
+            print(f"🔎 Critical Pattern Detection:")
+            for kind, (matched, sensitive) in critical_patterns.items():
+                if matched:
+                    print(f"   {kind}: {sensitive}/{matched} fields classified as sensitive")
             
             # Validate accuracy targets
             if false_hipaa_rate == 0.0:
@@ -387,47 +564,44 @@ class PIIScannerBackendTester:
             self.test_results['errors'].append(f"Accuracy analysis error: {str(e)}")
             return False
 
+    def _probe_endpoint(self, client: Any, label: str, path: str) -> Tuple[bool, str]:
+        """GET a single endpoint and return its status with a printable message"""
+        try:
+            response = client.get(f"{self.api_base}{path}", timeout=10)
+            if response.status_code == 200:
+                return True, f"✅ {label} endpoint working ({getattr(response, 'http_version', 'HTTP/1.1')})"
+            return False, f"❌ {label} endpoint failed: HTTP {response.status_code}"
+        except Exception as e:
+            return False, f"❌ {label} endpoint error: {str(e)}"
+
     def test_additional_endpoints(self, session_id: str) -> Dict[str, bool]:
         """Test additional API endpoints"""
         print("🔗 Testing Additional API Endpoints...")
         
-        endpoint_results = {}
+        probes = {
+            'session_status': ("Session Status", f"/session/{session_id}/status"),
+            'reports': ("Reports", "/reports"),
+            'performance_stats': ("Performance Stats", "/performance/stats"),
+        }
         
-        # Test session status endpoint
+        # The probes are independent GETs, so overlap their round trips. With HTTP/2
+        # available they share one multiplexed connection instead of one connection each.
+        client = httpx.Client(http2=True, headers={'Accept': 'application/json'}) if httpx else self.session
         try:
-            response = self.session.get(f"{self.api_base}/session/{session_id}/status", timeout=10)
-            endpoint_results['session_status'] = response.status_code == 200
-            if response.status_code == 200:
-                print("✅ Session Status endpoint working")
-            else:
-                print(f"❌ Session Status endpoint failed: HTTP {response.status_code}")
-        except Exception as e:
-            endpoint_results['session_status'] = False
-            print(f"❌ Session Status endpoint error: {str(e)}")
+            with ThreadPoolExecutor(max_workers=len(probes)) as executor:
+                futures = {
+                    name: executor.submit(self._probe_endpoint, client, label, path)
+                    for name, (label, path) in probes.items()
+                }
+        finally:
+            if client is not self.session:
+                client.close()
         
-        # Test reports endpoint
-        try:
-            response = self.session.get(f"{self.api_base}/reports", timeout=10)
-            endpoint_results['reports'] = response.status_code == 200
-            if response.status_code == 200:
-                print("✅ Reports endpoint working")
-            else:
-                print(f"❌ Reports endpoint failed: HTTP {response.status_code}")
-        except Exception as e:
-            endpoint_results['reports'] = False
-            print(f"❌ Reports endpoint error: {str(e)}")
-        
-        # Test performance stats endpoint
-        try:
-            response = self.session.get(f"{self.api_base}/performance/stats", timeout=10)
-            endpoint_results['performance_stats'] = response.status_code == 200
-            if response.status_code == 200:
-                print("✅ Performance Stats endpoint working")
-            else:
-                print(f"❌ Performance Stats endpoint failed: HTTP {response.status_code}")
-        except Exception as e:
-            endpoint_results['performance_stats'] = False
-            print(f"❌ Performance Stats endpoint error: {str(e)}")
+        endpoint_results = {}
+        for name, future in futures.items():
+            ok, message = future.result()
+            endpoint_results[name] = ok
+            print(message)
         
         self.test_results['api_endpoints'].update(endpoint_results)
         return endpoint_results
@@ -453,12 +627,13 @@ class PIIScannerBackendTester:
             print("❌ Schema upload failed - aborting classification tests")
             return self.test_results
         
-        # 3. Test schema extraction
-        extract_ok = self.test_extract_schema_endpoint(session_id)
-        
-        if not extract_ok:
-            print("❌ Schema extraction failed - aborting classification tests")
-            return self.test_results
+        # 3. Test schema extraction; the fused /pipeline call extracts and configures itself
+        if not self.fused:
+            extract_ok, _ = self.test_extract_schema_endpoint(session_id)
+            
+            if not extract_ok:
+                print("❌ Schema extraction failed - aborting classification tests")
+                return self.test_results
         
         # 4. Test classification and accuracy
         classify_ok = self.test_classify_endpoint(session_id)
@@ -528,7 +703,7 @@ class PIIScannerBackendTester:
 
 def main():
     """Main test execution function"""
-    tester = PIIScannerBackendTester()
+    tester = PIIScannerBackendTester(fused=os.environ.get('FUSED_PIPELINE', '0') == '1')
     results = tester.run_comprehensive_test()
     
     # Return exit code based on results
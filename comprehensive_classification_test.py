@@ -4,13 +4,25 @@ Comprehensive classification test to validate 95%+ auto-classification rate.
 This test simulates real-world database schemas to ensure high coverage.
 """
 
+import os
+import sys
+
 from pii_scanner_poc.core.inhouse_classification_engine import InHouseClassificationEngine
 from pii_scanner_poc.models.data_models import Regulation
 
-def test_comprehensive_field_classification():
+# Column indices of the per-category counter rows; LOW/MEDIUM/HIGH are
+# consecutive so a confidence bin (0, 1, 2) is an offset from LOW
+TOTAL, AUTO_CLASSIFIED, LOW, MEDIUM, HIGH, FAILED = range(6)
+AUTO_THRESHOLD, HIGH_THRESHOLD = 0.50, 0.80
+BIN_LABELS = ("LOW", "MEDIUM", "HIGH")
+
+def test_comprehensive_field_classification(engine=None):
     """Test a comprehensive set of database fields to achieve 95%+ auto-classification"""
     
-    engine = InHouseClassificationEngine()
+    if engine is None:
+        engine = InHouseClassificationEngine()
+    reg = Regulation.GDPR
+    ctx = 'test_table'
     
     # Comprehensive test dataset covering typical database schemas
     test_cases = {
@@ -69,85 +81,87 @@ def test_comprehensive_field_classification():
     
     total_fields = 0
     auto_classified_fields = 0  # Fields with confidence >= 50%
-    results_by_category = {}
+    # One counter row per category, indexed by the column constants above
+    counts = [[0] * 6 for _ in test_cases]
     
     print("=== COMPREHENSIVE FIELD CLASSIFICATION TEST ===\n")
     
-    for category, fields in test_cases.items():
+    # Every category goes through one classify_stream call, so a name listed in several
+    # categories is classified once and a single thread pool serves the whole run
+    flat = [(idx, field) for idx, fields in enumerate(test_cases.values()) for field in fields]
+    category_lines = [[] for _ in test_cases]
+    for row, fields in zip(counts, test_cases.values()):
+        row[TOTAL] = len(fields)
+    total_fields = len(flat)
+    
+    crash = None
+    # The engine handles per-field errors itself: guard the run, not each field
+    try:
+        results = engine.classify_stream([field for _, field in flat], regulation=reg, table_context=ctx,
+                                         max_workers=os.cpu_count())
+        for (idx, field), (_, result) in zip(flat, results):
+            row = counts[idx]
+            if result:
+                pattern, confidence = result
+                
+                # 0 = low, 1 = medium (auto-classified), 2 = high
+                bin_idx = (confidence >= AUTO_THRESHOLD) + (confidence >= HIGH_THRESHOLD)
+                auto = bin_idx > 0
+                auto_classified_fields += auto
+                row[AUTO_CLASSIFIED] += auto
+                row[LOW + bin_idx] += 1
+                confidence_label = BIN_LABELS[bin_idx]
+                
+                pii_type = pattern.pii_type.name
+                category_lines[idx].append(f"  {field:<25} -> {round(confidence * 100)}% ({confidence_label}) - {pii_type}\n")
+            else:
+                row[FAILED] += 1
+                category_lines[idx].append(f"  {field:<25} -> FAILED (No classification result)\n")
+    except Exception as e:
+        crash = str(e)
+    
+    # Per-category lines are written out once per category
+    for row, lines, (category, fields) in zip(counts, category_lines, test_cases.items()):
         print(f"Testing {category.replace('_', ' ').title()} ({len(fields)} fields):")
         print("-" * 60)
         
-        category_results = {
-            'total': len(fields),
-            'auto_classified': 0,
-            'high_confidence': 0,
-            'medium_confidence': 0, 
-            'low_confidence': 0,
-            'failed': 0
-        }
+        # After a crash, every field not yet tallied counts as failed
+        untallied = row[TOTAL] - row[HIGH] - row[MEDIUM] - row[LOW] - row[FAILED]
+        if crash is not None and untallied:
+            row[FAILED] += untallied
+            lines.append(f"  Category {category} crashed: {crash}\n")
         
-        for field in fields:
-            total_fields += 1
-            try:
-                result = engine.classify_field(field, regulation=Regulation.GDPR, table_context='test_table')
-                
-                if result:
-                    pattern, confidence = result
-                    
-                    if confidence >= 0.50:  # Auto-classification threshold
-                        auto_classified_fields += 1
-                        category_results['auto_classified'] += 1
-                        
-                        if confidence >= 0.80:
-                            category_results['high_confidence'] += 1
-                            confidence_label = "HIGH"
-                        elif confidence >= 0.50:
-                            category_results['medium_confidence'] += 1  
-                            confidence_label = "MEDIUM"
-                        else:
-                            category_results['low_confidence'] += 1
-                            confidence_label = "LOW"
-                    else:
-                        category_results['low_confidence'] += 1
-                        confidence_label = "LOW"
-                    
-                    print(f"  {field:<25} -> {confidence:.0%} ({confidence_label}) - {pattern.pii_type.name}")
-                else:
-                    category_results['failed'] += 1
-                    print(f"  {field:<25} -> FAILED (No classification result)")
-                    
-            except Exception as e:
-                category_results['failed'] += 1
-                print(f"  {field:<25} -> ERROR: {str(e)}")
-        
-        results_by_category[category] = category_results
+        sys.stdout.write("".join(lines))
         
-        auto_rate = (category_results['auto_classified'] / category_results['total']) * 100
+        auto_rate = (row[AUTO_CLASSIFIED] / row[TOTAL]) * 100
         print(f"\nCategory Auto-Classification Rate: {auto_rate:.1f}%")
-        print(f"High Confidence: {category_results['high_confidence']}, Medium: {category_results['medium_confidence']}, Low: {category_results['low_confidence']}, Failed: {category_results['failed']}\n")
+        print(f"High Confidence: {row[HIGH]}, Medium: {row[MEDIUM]}, Low: {row[LOW]}, Failed: {row[FAILED]}\n")
     
     # Overall results
     overall_auto_rate = (auto_classified_fields / total_fields) * 100
     print("=" * 80)
     print(f"OVERALL RESULTS:")
     print(f"Total Fields Tested: {total_fields}")
-    print(f"Auto-Classified (≥50% confidence): {auto_classified_fields}")
+    print(f"Auto-Classified (>=50% confidence): {auto_classified_fields}")
     print(f"Overall Auto-Classification Rate: {overall_auto_rate:.1f}%")
-    print(f"Target: 95% | Status: {'✅ PASSED' if overall_auto_rate >= 95.0 else '❌ NEEDS IMPROVEMENT'}")
+    print(f"Target: 95% | Status: {'[PASS]' if overall_auto_rate >= 95.0 else '[FAIL] NEEDS IMPROVEMENT'}")
     print("=" * 80)
     
     # Detailed breakdown
     print(f"\nDETAILED BREAKDOWN:")
-    for category, results in results_by_category.items():
-        rate = (results['auto_classified'] / results['total']) * 100
-        print(f"{category.replace('_', ' ').title():<30}: {rate:5.1f}% ({results['auto_classified']}/{results['total']})")
+    rates = [row[AUTO_CLASSIFIED] / row[TOTAL] * 100 for row in counts]
+    for category, row, rate in zip(test_cases, counts, rates):
+        print(f"{category.replace('_', ' ').title():<30}: {rate:5.1f}% ({row[AUTO_CLASSIFIED]}/{row[TOTAL]})")
     
     return overall_auto_rate
 
-def test_real_world_database_schema():
+def test_real_world_database_schema(engine=None):
     """Test with real-world database schema field names"""
     
-    engine = InHouseClassificationEngine()
+    if engine is None:
+        engine = InHouseClassificationEngine()
+    reg = Regulation.GDPR
+    ctx = 'business_table'
     
     print(f"\n{'='*80}")
     print("REAL-WORLD DATABASE SCHEMA TEST")
@@ -182,10 +196,10 @@ def test_real_world_database_schema():
     
     print(f"Testing {total} real-world database fields:\n")
     
-    for field in real_world_fields:
-        try:
-            result = engine.classify_field(field, regulation=Regulation.GDPR, table_context='business_table')
-            
+    lines = []
+    try:
+        for field, result in engine.classify_stream(real_world_fields, regulation=reg, table_context=ctx,
+                                                    max_workers=os.cpu_count()):
             if result:
                 pattern, confidence = result
                 if confidence >= 0.50:
@@ -194,27 +208,32 @@ def test_real_world_database_schema():
                 else:
                     status = "REVIEW"
                     
-                print(f"  {field:<25} -> {confidence:.0%} ({status}) - {pattern.pii_type.name}")
+                pii_type = pattern.pii_type.name
+                lines.append(f"  {field:<25} -> {round(confidence * 100)}% ({status}) - {pii_type}\n")
             else:
-                print(f"  {field:<25} -> No Result")
-                
-        except Exception as e:
-            print(f"  {field:<25} -> ERROR: {str(e)}")
+                lines.append(f"  {field:<25} -> No Result\n")
+    except Exception as e:
+        lines.append(f"  Real-world schema test crashed: {str(e)}\n")
+    
+    sys.stdout.write("".join(lines))
     
     real_world_rate = (auto_classified / total) * 100
     print(f"\nReal-World Auto-Classification Rate: {real_world_rate:.1f}%")
     print(f"Auto-Classified: {auto_classified}/{total}")
-    print(f"Target: 95% | Status: {'✅ PASSED' if real_world_rate >= 95.0 else '❌ NEEDS IMPROVEMENT'}")
+    print(f"Target: 95% | Status: {'[PASS]' if real_world_rate >= 95.0 else '[FAIL] NEEDS IMPROVEMENT'}")
     
     return real_world_rate
 
 if __name__ == "__main__":
     try:
+        # Build the engine once and share it between both tests
+        engine = InHouseClassificationEngine()
+        
         # Run comprehensive test
-        overall_rate = test_comprehensive_field_classification()
+        overall_rate = test_comprehensive_field_classification(engine)
         
         # Run real-world test  
-        real_world_rate = test_real_world_database_schema()
+        real_world_rate = test_real_world_database_schema(engine)
         
         # Final assessment
         print(f"\n{'='*80}")
@@ -227,9 +246,9 @@ if __name__ == "__main__":
         print(f"Average Auto-Classification Rate: {average_rate:.1f}%")
         
         if average_rate >= 95.0:
-            print("🎉 SUCCESS: System achieves 95%+ auto-classification rate!")
+            print("[OK] SUCCESS: System achieves 95%+ auto-classification rate!")
         else:
-            print("⚠️  NEEDS IMPROVEMENT: System below 95% auto-classification target")
+            print("WARN: NEEDS IMPROVEMENT: System below 95% auto-classification target")
             print("   - Consider enhancing medium-confidence patterns")
             print("   - Add more business domain patterns")
             print("   - Improve fuzzy matching capabilities")
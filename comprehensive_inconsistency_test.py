@@ -30,24 +30,109 @@ Version: 1.0 - Comprehensive Inconsistency Verification
 """
 
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import io
 import time
-import uuid
 import os
-from typing import Dict, List, Any, Tuple
-from datetime import datetime
+import sys
+import threading
+from contextlib import contextmanager
+from operator import countOf
+from typing import Dict, List, Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson                                   # Fast JSON encoding/decoding for the large payloads
+except ImportError:
+    orjson = None                                   # Fall back to requests' stdlib-based codec
+
+try:
+    from requests_toolbelt import MultipartEncoder  # Streams multipart bodies from file handles
+except ImportError:
+    MultipartEncoder = None                         # Fall back to requests' in-memory encoder
+
+def _json(response: requests.Response) -> Any:
+    """Decode a JSON response body, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+class _ThreadOutput:
+    """Stand-in for sys.stdout while work runs on worker threads: each task's output goes to
+    its own buffer, so its section can be printed intact once the task has finished"""
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+    
+    def write(self, text: str) -> int:
+        buffer = getattr(self._local, 'buffer', None)
+        return (self.stream if buffer is None else buffer).write(text)
+    
+    def flush(self) -> None:
+        self.stream.flush()
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.stream, name)
+    
+    def run(self, task, *args) -> Tuple[Any, str]:
+        """Call task on this thread with its output captured; returns (result, output)"""
+        self._local.buffer = io.StringIO()
+        try:
+            return task(*args), self._local.buffer.getvalue()
+        finally:
+            self._local.buffer = None
+
+@contextmanager
+def _thread_output():
+    """Route sys.stdout through a _ThreadOutput, reusing one installed by an enclosing caller"""
+    if isinstance(sys.stdout, _ThreadOutput):
+        yield sys.stdout
+        return
+    output = _ThreadOutput(sys.stdout)
+    sys.stdout = output
+    try:
+        yield output
+    finally:
+        sys.stdout = output.stream
 
 class ComprehensiveInconsistencyTester:
-    def __init__(self):
+    # Fields targeted by the review's misclassification fixes -> fix they verify
+    TARGET_FIELDS = {
+        'cancelled_date': 'cancelled_date_fix',
+        'middle_initial': 'middle_initial_fix',
+        'medication_name': 'medication_name_fix',
+    }
+    
+    def __init__(self, ddl_path: str = '/app/inconsistency_test_ddl.sql'):
+        # DDL file uploaded by this tester; one tester runs one session
+        self.ddl_path = ddl_path
+        
         # Use the correct backend URL from frontend environment
         self.base_url = "https://pii-dashboard.preview.emergentagent.com"
         self.api_base = f"{self.base_url}/api"
         self.session = requests.Session()
+        
+        # Keep-alive pool shared by the overlapped steps, with retries on gateway errors
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=8,
+            max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.session.headers.update({
             'Content-Type': 'application/json',
             'Accept': 'application/json'
         })
         
+        # Per-field classification lines are only printed with VERBOSE=1
+        self.verbose = os.environ.get('VERBOSE', '0') == '1'
+        
+        # Tables returned by /extract-schema, keyed by session_id
+        self._tables_cache: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        
         # Test results tracking
         self.test_results = {
             'health_check': False,
@@ -82,6 +167,27 @@ class ComprehensiveInconsistencyTester:
         print(f"🎯 API Base: {self.api_base}")
         print("=" * 80)
 
+    def _post_json(self, url: str, payload: Any, **kwargs) -> requests.Response:
+        """POST a JSON body, pre-serialized with orjson when it is installed"""
+        if orjson is None:
+            return self.session.post(url, json=payload, **kwargs)
+        # The session already sends Content-Type: application/json
+        return self.session.post(url, data=orjson.dumps(payload), **kwargs)
+
+    def _get_tables(self, session_id: str) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        """Return the extracted tables for a session, calling /extract-schema only on a cache miss"""
+        tables = self._tables_cache.get(session_id)
+        if tables is None:
+            response = self.session.post(
+                f"{self.api_base}/extract-schema/{session_id}",
+                json={},
+                timeout=30
+            )
+            if response.status_code != 200:
+                return None
+            tables = self._tables_cache[session_id] = _json(response).get('tables', {})
+        return tables
+
     def test_health_endpoint(self) -> bool:
         """Test the health check endpoint"""
         print("🏥 Testing Health Endpoint...")
@@ -106,10 +212,9 @@ class ComprehensiveInconsistencyTester:
         """Test schema upload with inconsistency_test_ddl.sql file"""
         print("📤 Testing Schema Upload with inconsistency_test_ddl.sql...")
         
-        # Load the inconsistency_test_ddl.sql file with specific fields for testing
+        # Open the inconsistency_test_ddl.sql file; the handle is streamed rather than read into memory
         try:
-            with open('/app/inconsistency_test_ddl.sql', 'r') as f:
-                ddl_content = f.read()
+            ddl_file = open(self.ddl_path, 'rb')
         except Exception as e:
             print(f"❌ Failed to load inconsistency_test_ddl.sql: {str(e)}")
             self.test_results['errors'].append(f"Failed to load DDL file: {str(e)}")
@@ -118,18 +223,29 @@ class ComprehensiveInconsistencyTester:
         try:
             # Prepare multipart form data
             files = {
-                'file': ('inconsistency_test_ddl.sql', ddl_content, 'text/plain')
+                'file': ('inconsistency_test_ddl.sql', ddl_file, 'text/plain')
             }
             
-            # Remove Content-Type header for multipart upload
-            headers = {k: v for k, v in self.session.headers.items() if k.lower() != 'content-type'}
-            
-            response = requests.post(
-                f"{self.api_base}/upload-schema",
-                files=files,
-                headers=headers,
-                timeout=30
-            )
+            # Drop the session's JSON Content-Type so requests sets the multipart boundary
+            headers = {'Content-Type': None}
+            
+            if MultipartEncoder is not None:
+                # Encoder reads the file in chunks while the body is sent
+                encoder = MultipartEncoder(fields=files)
+                headers['Content-Type'] = encoder.content_type
+                response = self.session.post(
+                    f"{self.api_base}/upload-schema",
+                    data=encoder,
+                    headers=headers,
+                    timeout=30
+                )
+            else:
+                response = self.session.post(
+                    f"{self.api_base}/upload-schema",
+                    files=files,
+                    headers=headers,
+                    timeout=30
+                )
             
             if response.status_code == 200:
                 upload_data = response.json()
@@ -150,6 +266,8 @@ class ComprehensiveInconsistencyTester:
             print(f"❌ Schema Upload Error: {str(e)}")
             self.test_results['errors'].append(f"Schema upload error: {str(e)}")
             return False, ""
+        finally:
+            ddl_file.close()
 
     def test_extract_schema_and_verify_tables(self, session_id: str) -> bool:
         """Test schema extraction and verify tables are properly parsed"""
@@ -163,8 +281,9 @@ class ComprehensiveInconsistencyTester:
             )
             
             if response.status_code == 200:
-                extract_data = response.json()
+                extract_data = _json(response)
                 tables = extract_data.get('tables', {})
+                self._tables_cache[session_id] = tables
                 print(f"✅ Schema Extraction Success: {len(tables)} tables extracted")
                 
                 # Verify expected tables are present and not assigned to 'unknown_table'
@@ -215,19 +334,13 @@ class ComprehensiveInconsistencyTester:
         print("🎯 Testing Classification and Verifying Inconsistency Fixes...")
         
         try:
-            # First get the extracted tables to configure scan
-            extract_response = self.session.post(
-                f"{self.api_base}/extract-schema/{session_id}",
-                json={},
-                timeout=30
-            )
+            # Reuse the tables from the extraction step to configure the scan
+            tables_dict = self._get_tables(session_id)
             
-            if extract_response.status_code != 200:
+            if tables_dict is None:
                 print(f"❌ Failed to get tables for scan configuration")
                 return False
             
-            extract_data = extract_response.json()
-            tables_dict = extract_data.get('tables', {})
             tables = list(tables_dict.keys())
             
             print(f"📋 Found {len(tables)} tables for scanning: {tables}")
@@ -250,21 +363,22 @@ class ComprehensiveInconsistencyTester:
             print("⚙️ Scan configured successfully")
             
             # Build selected_fields from extracted schema
-            selected_fields = []
-            for table_name, columns in tables_dict.items():
-                for column in columns:
-                    selected_fields.append({
-                        "table_name": table_name,
-                        "column_name": column["column_name"],
-                        "data_type": column["data_type"]
-                    })
+            selected_fields = [
+                {
+                    "table_name": table_name,
+                    "column_name": column["column_name"],
+                    "data_type": column["data_type"]
+                }
+                for table_name, columns in tables_dict.items()
+                for column in columns
+            ]
             
             print(f"📊 Prepared {len(selected_fields)} fields for classification")
             
             # Start classification
-            classify_response = self.session.post(
+            classify_response = self._post_json(
                 f"{self.api_base}/classify",
-                json={
+                {
                     "session_id": session_id,
                     "selected_fields": selected_fields,
                     "regulations": ["HIPAA", "GDPR", "CCPA"]
@@ -273,7 +387,7 @@ class ComprehensiveInconsistencyTester:
             )
             
             if classify_response.status_code == 200:
-                classify_data = classify_response.json()
+                classify_data = _json(classify_response)
                 print(f"✅ Classification Success: {classify_data.get('message', 'Completed')}")
                 
                 # Verify specific inconsistency fixes
@@ -311,47 +425,67 @@ class ComprehensiveInconsistencyTester:
             
             print(f"\n📊 Analyzing {len(field_analyses)} classified fields...")
             
+            # Collect per-field output and write it once after the loop
+            log_lines = []
+            verbose = self.verbose
+            
+            # Lowercase every field/table name up front into parallel columns
+            analyses = list(field_analyses.values())
+            field_names = [analysis.get('field_name', '').lower() for analysis in analyses]
+            table_names = [analysis.get('table_name', '').lower() for analysis in analyses]
+            
             # Check each field for specific fixes
-            for field_key, analysis in field_analyses.items():
-                field_name = analysis.get('field_name', '').lower()
-                table_name = analysis.get('table_name', '').lower()
+            for field_key, analysis, field_name, table_name in zip(field_analyses, analyses, field_names, table_names):
                 classification = analysis.get('classification', '')
                 regulations = analysis.get('applicable_regulations', [])
+                regs = frozenset(regulations)  # O(1) membership for the PHONE/HIPAA checks
                 is_sensitive = analysis.get('is_sensitive', False)
                 
-                print(f"   🔍 {field_key}: {classification} -> {regulations} (sensitive: {is_sensitive})")
+                if verbose:
+                    log_lines.append(f"   🔍 {field_key}: {classification} -> {regulations} (sensitive: {is_sensitive})")
+                
+                # One lookup decides which field fix (if any) this analysis verifies
+                fix_key = self.TARGET_FIELDS.get(field_name)
                 
                 # Fix 1: cancelled_date should NOT be classified as PHONE (should be NON_SENSITIVE DATE)
-                if 'cancelled_date' in field_name:
-                    if 'PHONE' not in classification and 'PHONE' not in str(regulations):
+                if fix_key == 'cancelled_date_fix':
+                    if 'PHONE' not in classification and 'PHONE' not in regs:
                         fixes_verified['cancelled_date_fix'] = True
-                        print(f"   ✅ FIX 1 VERIFIED: cancelled_date NOT classified as PHONE")
+                        log_lines.append(f"   ✅ FIX 1 VERIFIED: cancelled_date NOT classified as PHONE")
                     else:
-                        print(f"   ❌ FIX 1 FAILED: cancelled_date still classified as PHONE")
+                        log_lines.append(f"   ❌ FIX 1 FAILED: cancelled_date still classified as PHONE")
                 
                 # Fix 2: middle_initial should be classified as NAME_COMPONENT not PATIENT_ID
-                if 'middle_initial' in field_name:
+                elif fix_key == 'middle_initial_fix':
                     if 'NAME' in classification and 'PATIENT_ID' not in classification:
                         fixes_verified['middle_initial_fix'] = True
-                        print(f"   ✅ FIX 2 VERIFIED: middle_initial classified as NAME_COMPONENT, not PATIENT_ID")
+                        log_lines.append(f"   ✅ FIX 2 VERIFIED: middle_initial classified as NAME_COMPONENT, not PATIENT_ID")
                     else:
-                        print(f"   ❌ FIX 2 FAILED: middle_initial not properly classified")
+                        log_lines.append(f"   ❌ FIX 2 FAILED: middle_initial not properly classified")
                 
                 # Fix 3: medication_name should be NON_SENSITIVE not NAME
-                if 'medication_name' in field_name:
+                elif fix_key == 'medication_name_fix':
                     if not is_sensitive or 'NON_SENSITIVE' in classification:
                         fixes_verified['medication_name_fix'] = True
-                        print(f"   ✅ FIX 3 VERIFIED: medication_name classified as NON_SENSITIVE")
+                        log_lines.append(f"   ✅ FIX 3 VERIFIED: medication_name classified as NON_SENSITIVE")
                     else:
-                        print(f"   ❌ FIX 3 FAILED: medication_name still classified as sensitive NAME")
+                        log_lines.append(f"   ❌ FIX 3 FAILED: medication_name still classified as sensitive NAME")
                 
                 # Fix 4: Fields in healthcare tables should get HIPAA regulation
-                if 'patient' in table_name and is_sensitive:
-                    if 'HIPAA' in regulations:
+                if is_sensitive and 'patient' in table_name:
+                    if 'HIPAA' in regs:
                         fixes_verified['healthcare_hipaa_fix'] = True
-                        print(f"   ✅ FIX 4 VERIFIED: Healthcare field {field_key} has HIPAA regulation")
+                        log_lines.append(f"   ✅ FIX 4 VERIFIED: Healthcare field {field_key} has HIPAA regulation")
                     else:
-                        print(f"   ❌ FIX 4 FAILED: Healthcare field {field_key} missing HIPAA regulation")
+                        log_lines.append(f"   ❌ FIX 4 FAILED: Healthcare field {field_key} missing HIPAA regulation")
+                
+                # Flags only ever flip to True, so once all four hold the rest cannot change
+                # the outcome; verbose runs keep going to list every field
+                if not verbose and all(fixes_verified.values()):
+                    break
+            
+            if log_lines:
+                sys.stdout.write("\n".join(log_lines) + "\n")
             
             # Update test results
             self.test_results['inconsistency_fixes'] = fixes_verified
@@ -387,7 +521,7 @@ class ComprehensiveInconsistencyTester:
             )
             
             if response.status_code == 200:
-                report_data = response.json()
+                report_data = _json(response)
                 print(f"✅ Report Generation Success")
                 
                 # Verify enhanced report structure
@@ -452,16 +586,16 @@ class ComprehensiveInconsistencyTester:
             
             print(f"\n📊 Detailed Findings Verification:")
             
-            # 4. Check sensitive fields arrays are populated
-            phi_fields = detailed_findings.get('phi_fields', [])
-            pii_fields = detailed_findings.get('pii_fields', [])
-            sensitive_fields = detailed_findings.get('sensitive_fields', [])
+            # 4. Check sensitive fields arrays are populated (only their sizes are needed)
+            phi_n = len(detailed_findings.get('phi_fields', ()))
+            pii_n = len(detailed_findings.get('pii_fields', ()))
+            sens_n = len(detailed_findings.get('sensitive_fields', ()))
             
-            if len(phi_fields) > 0 or len(pii_fields) > 0 or len(sensitive_fields) > 0:
+            if phi_n or pii_n or sens_n:
                 verification_results['sensitive_arrays_populated'] = True
-                print(f"   ✅ Sensitive arrays populated: PHI({len(phi_fields)}), PII({len(pii_fields)}), Sensitive({len(sensitive_fields)})")
+                print(f"   ✅ Sensitive arrays populated: PHI({phi_n}), PII({pii_n}), Sensitive({sens_n})")
             else:
-                print(f"   ❌ Sensitive arrays empty: PHI({len(phi_fields)}), PII({len(pii_fields)}), Sensitive({len(sensitive_fields)})")
+                print(f"   ❌ Sensitive arrays empty: PHI({phi_n}), PII({pii_n}), Sensitive({sens_n})")
             
             # 5. Check table breakdown shows actual table names
             table_breakdown = detailed_findings.get('table_breakdown', {})
@@ -476,8 +610,8 @@ class ComprehensiveInconsistencyTester:
             
             # 6. Check risk levels vary
             risk_breakdown = detailed_findings.get('risk_level_breakdown', {})
-            risk_levels = list(risk_breakdown.keys())
-            unique_risk_levels = len([level for level, count in risk_breakdown.items() if count > 0])
+            # Counts are non-negative, so the non-empty levels are all but the zero counts
+            unique_risk_levels = len(risk_breakdown) - countOf(risk_breakdown.values(), 0)
             
             if unique_risk_levels > 1:
                 verification_results['risk_levels_vary'] = True
@@ -486,21 +620,24 @@ class ComprehensiveInconsistencyTester:
                 print(f"   ❌ Risk levels don't vary: {risk_breakdown} (should have multiple levels)")
             
             # 7. Check PHI/PII fields are correctly categorized
-            if len(phi_fields) > 0 and len(pii_fields) > 0:
+            if phi_n and pii_n:
                 verification_results['phi_pii_categorized'] = True
-                print(f"   ✅ PHI/PII correctly categorized: PHI({len(phi_fields)}), PII({len(pii_fields)})")
-            elif len(phi_fields) > 0 or len(pii_fields) > 0:
+                print(f"   ✅ PHI/PII correctly categorized: PHI({phi_n}), PII({pii_n})")
+            elif phi_n or pii_n:
                 verification_results['phi_pii_categorized'] = True
-                print(f"   ✅ PHI/PII categorized: PHI({len(phi_fields)}), PII({len(pii_fields)})")
+                print(f"   ✅ PHI/PII categorized: PHI({phi_n}), PII({pii_n})")
             else:
-                print(f"   ❌ PHI/PII not categorized: PHI({len(phi_fields)}), PII({len(pii_fields)})")
+                print(f"   ❌ PHI/PII not categorized: PHI({phi_n}), PII({pii_n})")
             
             print(f"\n📊 Compliance Status Verification:")
             
             # 8. Verify compliance status reflects actual findings
             has_sensitive_data = sensitive_fields_found > 0
-            compliance_entries = list(compliance_status.values())
-            non_compliant_found = any('NON-COMPLIANT' in str(status) for status in compliance_entries)
+            # Status values are strings; short-circuits on the first NON-COMPLIANT entry
+            non_compliant_found = any(
+                isinstance(status, str) and 'NON-COMPLIANT' in status
+                for status in compliance_status.values()
+            )
             
             if has_sensitive_data and non_compliant_found:
                 verification_results['compliance_status_correct'] = True
@@ -542,40 +679,49 @@ class ComprehensiveInconsistencyTester:
             self.test_results['errors'].append(f"Report verification error: {str(e)}")
             return False
 
-    def run_comprehensive_test(self) -> Dict[str, Any]:
-        """Run comprehensive inconsistency fixes test"""
+    def run_comprehensive_test(self) -> Tuple[Dict[str, Any], bool]:
+        """Run comprehensive inconsistency fixes test; returns the results and the overall verdict"""
         print("🚀 Starting Comprehensive Inconsistency Fixes Test")
         print("=" * 80)
         
         start_time = time.time()
         
-        # 1. Test health endpoint
+        # 1-2. Health check and schema upload are independent, so overlap them; each section's
+        # output is captured and printed under its header once both have finished
+        with _thread_output() as output, ThreadPoolExecutor(max_workers=2) as executor:
+            health_future = executor.submit(output.run, self.test_health_endpoint)
+            upload_future = executor.submit(output.run, self.test_upload_simple_test_ddl)
+            health_ok, health_output = health_future.result()
+            (upload_ok, session_id), upload_output = upload_future.result()
+        
         print("\n1️⃣ HEALTH CHECK")
-        health_ok = self.test_health_endpoint()
+        sys.stdout.write(health_output)
+        print("\n2️⃣ SCHEMA UPLOAD & EXTRACT TABLES")
+        sys.stdout.write(upload_output)
         
         if not health_ok:
             print("❌ Health check failed - aborting further tests")
-            return self.test_results
-        
-        # 2. Test schema upload with simple_test_ddl.sql
-        print("\n2️⃣ SCHEMA UPLOAD & EXTRACT TABLES")
-        upload_ok, session_id = self.test_upload_simple_test_ddl()
+            return self.test_results, False
         
         if not upload_ok or not session_id:
             print("❌ Schema upload failed - aborting further tests")
-            return self.test_results
+            return self.test_results, False
         
         # 3. Test schema extraction and verify tables are properly parsed
         extract_ok = self.test_extract_schema_and_verify_tables(session_id)
         
         if not extract_ok:
             print("❌ Schema extraction failed - aborting classification tests")
-            return self.test_results
+            return self.test_results, False
         
         # 4. Test classification and verify inconsistency fixes
         print("\n3️⃣ CLASSIFICATION ACCURACY & INCONSISTENCY FIXES")
         classify_ok = self.test_classification_and_verify_fixes(session_id)
         
+        if not classify_ok:
+            print("❌ Classification failed - aborting report tests")
+            return self.test_results, False
+        
         # 5. Test report generation and verify enhancements
         print("\n4️⃣ REPORT GENERATION & ENHANCED SUMMARY")
         report_ok = self.test_report_generation_and_verify_enhancements(session_id)
@@ -646,30 +792,36 @@ class ComprehensiveInconsistencyTester:
         else:
             print("⚠️ Some inconsistency fixes or verifications failed. Review issues above.")
         
-        return self.test_results
+        return self.test_results, overall_success
+
+def run_sessions(ddl_paths: List[str]) -> List[Tuple[Dict[str, Any], bool]]:
+    """Run one full tester session per DDL file concurrently; sessions share nothing, and each
+    session's report is printed whole, in DDL order, as it completes"""
+    def run_one(ddl_path: str) -> Tuple[Dict[str, Any], bool]:
+        return ComprehensiveInconsistencyTester(ddl_path).run_comprehensive_test()
+    
+    all_results = []
+    with _thread_output() as output, ThreadPoolExecutor(max_workers=len(ddl_paths)) as executor:
+        futures = [executor.submit(output.run, run_one, ddl_path) for ddl_path in ddl_paths]
+        for future in futures:
+            result, session_output = future.result()
+            sys.stdout.write(session_output)
+            all_results.append(result)
+    return all_results
 
 def main():
     """Main test execution function"""
-    tester = ComprehensiveInconsistencyTester()
-    results = tester.run_comprehensive_test()
+    # INCONSISTENCY_DDLS=a.sql,b.sql runs a matrix of sessions side by side
+    ddl_paths = [path for path in os.environ.get('INCONSISTENCY_DDLS', '').split(',') if path]
     
-    # Return exit code based on results
-    core_success = all([
-        results['health_check'],
-        results['schema_upload'],
-        results['schema_extraction'],
-        results['classification'],
-        results['report_generation']
-    ])
-    
-    fixes_success = sum(results['inconsistency_fixes'].values()) >= 3
-    summary_success = sum(results['executive_summary_verification'].values()) >= 2
-    report_success = sum(results['report_verification'].values()) >= 4
-    
-    if core_success and fixes_success and summary_success and report_success:
-        exit(0)  # Success
+    if len(ddl_paths) > 1:
+        all_results = run_sessions(ddl_paths)
     else:
-        exit(1)  # Some tests failed
+        tester = ComprehensiveInconsistencyTester(*ddl_paths)
+        all_results = [tester.run_comprehensive_test()]
+    
+    # Exit code reuses the verdict each run already computed
+    sys.exit(0 if all(ok for _, ok in all_results) else 1)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -9,14 +9,14 @@ import os
 project_root = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, project_root)
 
-from pii_scanner_poc.core.inhouse_classification_engine import InHouseClassificationEngine
+from pii_scanner_poc.core._engine_singleton import get_engine
 from pii_scanner_poc.core.configuration import Regulation
 
 def test_single_field():
     """Test single field classification in detail"""
     
-    # Initialize classification engine directly
-    engine = InHouseClassificationEngine()
+    # Use the shared, already warmed classification engine
+    engine = get_engine()
     
     # Test a few key fields that should be caught by aggressive patterns
     test_fields = [
@@ -32,13 +32,12 @@ def test_single_field():
     
     print("=== DEBUG SINGLE FIELD CLASSIFICATION ===")
     
+    # One batch call; the test field names are distinct, so each has its own entry
+    results = engine.classify_fields(test_fields, regulation=Regulation.GDPR, table_context=None)
+    
     for field in test_fields:
         print(f"\nTesting field: {field}")
-        result = engine.classify_field(
-            field_name=field,
-            regulation=Regulation.GDPR,
-            table_context=None
-        )
+        result = results[field]
         
         if result:
             pattern, confidence = result
@@ -9,14 +9,14 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pii_scanner_poc'))
 
-from pii_scanner_poc.core.inhouse_classification_engine import InHouseClassificationEngine
+from pii_scanner_poc.core._engine_singleton import get_engine
 from pii_scanner_poc.models.enums import Regulation
 
 def test_classify_field_call():
     """Test the exact call pattern from backend"""
     try:
-        # Initialize engine
-        inhouse_engine = InHouseClassificationEngine()
+        # Use the shared, already warmed engine
+        inhouse_engine = get_engine()
         
         # Test the exact call pattern from backend/main.py line 844-845
         field_name = "customer_id"
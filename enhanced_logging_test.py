@@ -16,11 +16,112 @@ Test Requirements:
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import io
 import json
 import time
+import os
+import sys
+import threading
 import uuid
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson                   # Fast JSON encoding/decoding for the request and response bodies
+except ImportError:
+    orjson = None                   # Fall back to the stdlib json module
+
+try:
+    import h2                       # Required by httpx for HTTP/2 support
+    import httpx                    # HTTP/2 client used to multiplex the probes
+except ImportError:
+    httpx = None                    # Fall back to the pooled HTTP/1.1 requests session
+
+try:
+    import ijson                    # Incremental parsing of the classification response
+except ImportError:
+    ijson = None                    # Fall back to parsing the whole response body
+
+# Sample fields from the review request; the load test reuses them in rotated orders
+_SAMPLE_FIELDS = [
+    {"table_name": "users", "column_name": "email", "data_type": "VARCHAR"},
+    {"table_name": "users", "column_name": "first_name", "data_type": "VARCHAR"},
+    {"table_name": "patients", "column_name": "medical_record_number", "data_type": "VARCHAR"}
+]
+
+def _dumps(payload: Any) -> bytes:
+    """Encode a JSON request body, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode('utf-8')
+
+# Sample classification request from the review request, encoded once at import
+_SAMPLE_CLASSIFY_REQUEST = {
+    "session_id": "test-session-123",
+    "selected_fields": _SAMPLE_FIELDS,
+    "regulations": ["HIPAA", "GDPR"]
+}
+_SAMPLE_CLASSIFY_BODY = _dumps(_SAMPLE_CLASSIFY_REQUEST)
+
+# Request with an unknown session id for the error-handling probe
+_INVALID_CLASSIFY_BODY = _dumps({
+    "session_id": "invalid-session-999",
+    "selected_fields": [
+        {"table_name": "test", "column_name": "test_field", "data_type": "VARCHAR"}
+    ],
+    "regulations": ["HIPAA"]
+})
+
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+def _json(response) -> Any:
+    """Decode a requests or httpx JSON response body, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted, non-empty list"""
+    return sorted_values[round(fraction * (len(sorted_values) - 1))]
+
+def _read_json(response: requests.Response) -> Any:
+    """Parse a streamed JSON body as it downloads when ijson is installed, then release the connection"""
+    if ijson is None:
+        return _json(response)
+    try:
+        response.raw.decode_content = True
+        return dict(ijson.kvitems(response.raw, '', use_float=True))
+    finally:
+        response.close()
+
+class _ThreadOutput:
+    """Stand-in for sys.stdout while probes run on worker threads: each probe's output goes to
+    its own buffer, so its section can be printed intact once the probe has finished"""
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+    
+    def write(self, text: str) -> int:
+        buffer = getattr(self._local, 'buffer', None)
+        return (self.stream if buffer is None else buffer).write(text)
+    
+    def flush(self) -> None:
+        self.stream.flush()
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.stream, name)
+    
+    def run(self, probe, *args) -> Tuple[Any, str]:
+        """Call probe on this thread with its output captured; returns (result, output)"""
+        self._local.buffer = io.StringIO()
+        try:
+            return probe(*args), self._local.buffer.getvalue()
+        finally:
+            self._local.buffer = None
 
 class EnhancedLoggingTester:
     def __init__(self):
@@ -28,27 +129,72 @@ class EnhancedLoggingTester:
         self.base_url = "https://pii-dashboard.preview.emergentagent.com"
         self.api_base = f"{self.base_url}/api"
         self.session = requests.Session()
+        
+        # Keep-alive pool sized for the overlapped probes, with retries on gateway errors. The session
+        # mostly carries the streamed /classify POST, which urllib3 does not retry unless asked; the
+        # backend's classify only overwrites the session's results, so retrying it is safe. Once
+        # retries run out the last response is returned, so probes still report "HTTP 503"
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.1,
+                status_forcelist=[502, 503, 504],
+                allowed_methods=frozenset({'GET', 'POST'}),
+                raise_on_status=False
+            )
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.session.headers.update({
             'Content-Type': 'application/json',
             'Accept': 'application/json'
         })
         
+        # With HTTP/2 available the overlapped probes share one multiplexed connection, so the
+        # backend host is resolved and handshaken once per run; pooled HTTP/1.1 connections
+        # likewise resolve only when opened. The host is not pinned to an IP: the preview
+        # deployment sits behind a proxy whose addresses may change between runs.
+        # The streamed classification probe stays on the session, which exposes the raw socket.
+        if httpx is not None:
+            self.client = httpx.Client(
+                http2=True,
+                headers={'Accept': 'application/json'},
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=64),
+                timeout=30.0
+            )
+        else:
+            self.client = self.session
+        
         print("🔧 Enhanced Logging Integration Tester")
         print(f"📡 Backend URL: {self.base_url}")
         print(f"🎯 API Base: {self.api_base}")
         print("=" * 60)
 
+    def _post_body(self, client, url: str, body: bytes, **kwargs):
+        """POST a pre-encoded JSON body through either the requests session or the httpx client"""
+        if client is self.session:
+            return client.post(url, data=body, headers=_JSON_HEADERS, **kwargs)
+        return client.post(url, content=body, headers=_JSON_HEADERS, **kwargs)
+
+    def close(self) -> None:
+        """Close the HTTP/2 client and the session"""
+        if self.client is not self.session:
+            self.client.close()
+        self.session.close()
+
     def test_health_endpoint_logging(self) -> bool:
         """Test health endpoint with enhanced logging verification"""
         print("🏥 Testing Health Endpoint with Enhanced Logging...")
         
         try:
-            start_time = time.time()
-            response = self.session.get(f"{self.api_base}/health", timeout=10)
-            request_time = time.time() - start_time
+            start_time = time.perf_counter_ns()
+            response = self.client.get(f"{self.api_base}/health", timeout=10)
+            request_time = (time.perf_counter_ns() - start_time) / 1e9
             
             if response.status_code == 200:
-                health_data = response.json()
+                health_data = _json(response)
                 print(f"✅ Health Check Response: {health_data.get('status', 'Unknown')}")
                 print(f"   Version: {health_data.get('version', 'Unknown')}")
                 print(f"   Components: {health_data.get('components', {})}")
@@ -82,131 +228,181 @@ class EnhancedLoggingTester:
         """Test classification endpoint with comprehensive logging verification"""
         print("🎯 Testing Classification Endpoint with Enhanced Logging...")
         
-        # Sample classification request from the review request
-        sample_request = {
-            "session_id": "test-session-123",
-            "selected_fields": [
-                {"table_name": "users", "column_name": "email", "data_type": "VARCHAR"},
-                {"table_name": "users", "column_name": "first_name", "data_type": "VARCHAR"},
-                {"table_name": "patients", "column_name": "medical_record_number", "data_type": "VARCHAR"}
-            ],
-            "regulations": ["HIPAA", "GDPR"]
-        }
+        sample_request = _SAMPLE_CLASSIFY_REQUEST
         
         try:
             print(f"📊 Testing with {len(sample_request['selected_fields'])} fields")
             print(f"📋 Target regulations: {sample_request['regulations']}")
             
-            start_time = time.time()
-            response = self.session.post(
+            start_time = time.perf_counter_ns()
+            response = self._post_body(
+                self.session,
                 f"{self.api_base}/classify",
-                json=sample_request,
-                timeout=30
+                _SAMPLE_CLASSIFY_BODY,
+                timeout=30,
+                stream=True
             )
-            request_time = time.time() - start_time
+            request_time = (time.perf_counter_ns() - start_time) / 1e9
             
             print(f"⏱️ Classification request completed in {request_time:.3f}s")
             
-            if response.status_code == 200:
-                classify_data = response.json()
-                print("✅ Classification Request Successful")
+            # Non-200 responses are never read through _read_json, so release the connection here
+            try:
+                if response.status_code == 200:
+                    classify_data = _read_json(response)
+                    print("✅ Classification Request Successful")
                 
-                # Verify response structure
-                expected_keys = ['results', 'session_id', 'processing_time', 'debug_info']
-                missing_keys = [key for key in expected_keys if key not in classify_data]
+                    # Verify response structure
+                    expected_keys = ['results', 'session_id', 'processing_time', 'debug_info']
+                    missing_keys = [key for key in expected_keys if key not in classify_data]
                 
-                if missing_keys:
-                    print(f"⚠️ Missing expected response keys: {missing_keys}")
-                else:
-                    print("✅ All expected response keys present")
+                    if missing_keys:
+                        print(f"⚠️ Missing expected response keys: {missing_keys}")
+                    else:
+                        print("✅ All expected response keys present")
                 
-                # Analyze results structure
-                results = classify_data.get('results', {})
-                field_analyses = results.get('field_analyses', {})
-                summary = results.get('summary', {})
+                    # Analyze results structure
+                    results = classify_data.get('results', {})
+                    field_analyses = results.get('field_analyses', {})
+                    summary = results.get('summary', {})
                 
-                print(f"📈 Classification Results Analysis:")
-                print(f"   Total Fields Analyzed: {len(field_analyses)}")
-                print(f"   Summary Data: {summary}")
+                    print(f"📈 Classification Results Analysis:")
+                    print(f"   Total Fields Analyzed: {len(field_analyses)}")
+                    print(f"   Summary Data: {summary}")
                 
-                # Verify enhanced logging debug info
-                debug_info = classify_data.get('debug_info', {})
-                if debug_info:
-                    print(f"🔍 Debug Information Present:")
-                    print(f"   Backend Version: {debug_info.get('backend_version')}")
-                    print(f"   Classification Engine: {debug_info.get('classification_engine')}")
-                    print(f"   Timestamp: {debug_info.get('timestamp')}")
-                    print("✅ Enhanced logging debug info captured")
-                else:
-                    print("⚠️ No debug information in response")
+                    # Verify enhanced logging debug info
+                    debug_info = classify_data.get('debug_info', {})
+                    if debug_info:
+                        sys.stdout.write(
+                            f"🔍 Debug Information Present:\n"
+                            f"   Backend Version: {debug_info.get('backend_version')}\n"
+                            f"   Classification Engine: {debug_info.get('classification_engine')}\n"
+                            f"   Timestamp: {debug_info.get('timestamp')}\n"
+                            "✅ Enhanced logging debug info captured\n"
+                        )
+                    else:
+                        print("⚠️ No debug information in response")
                 
-                # Verify processing time logging
-                processing_time = classify_data.get('processing_time')
-                if processing_time:
-                    print(f"⏱️ Processing Time Logged: {processing_time}")
-                    print("✅ Performance metrics captured")
-                else:
-                    print("⚠️ Processing time not logged")
+                    # Verify processing time logging
+                    processing_time = classify_data.get('processing_time')
+                    if processing_time:
+                        print(f"⏱️ Processing Time Logged: {processing_time}")
+                        print("✅ Performance metrics captured")
+                    else:
+                        print("⚠️ Processing time not logged")
                 
-                # Analyze field-level results
-                print(f"\n📋 Field-Level Analysis:")
-                for field_key, field_data in field_analyses.items():
-                    table_name = field_data.get('table_name')
-                    field_name = field_data.get('field_name')
-                    is_sensitive = field_data.get('is_sensitive')
-                    regulations = field_data.get('applicable_regulations', [])
-                    confidence = field_data.get('confidence_score', 0)
+                    # Analyze field-level results; lines are buffered and written once
+                    lines = ["\n📋 Field-Level Analysis:\n"]
+                    for field_key, field_data in field_analyses.items():
+                        table_name = field_data.get('table_name')
+                        field_name = field_data.get('field_name')
+                        is_sensitive = field_data.get('is_sensitive')
+                        regulations = field_data.get('applicable_regulations', [])
+                        confidence = field_data.get('confidence_score', 0)
                     
-                    status_icon = "🔒" if is_sensitive else "🔓"
-                    reg_text = ", ".join(regulations) if regulations else "Non-PII"
+                        status_icon = "🔒" if is_sensitive else "🔓"
+                        reg_text = ", ".join(regulations) if regulations else "Non-PII"
                     
-                    print(f"   {status_icon} {table_name}.{field_name}: {reg_text} (confidence: {confidence:.2f})")
+                        lines.append(f"   {status_icon} {table_name}.{field_name}: {reg_text} (confidence: {confidence:.2f})\n")
+                    sys.stdout.write("".join(lines))
                 
-                # Verify context-aware classification
-                healthcare_fields = [f for f in field_analyses.values() 
-                                   if 'medical' in f.get('field_name', '').lower() or 
-                                      'patient' in f.get('table_name', '').lower()]
+                    # Verify context-aware classification
+                    healthcare_fields = [f for f in field_analyses.values() 
+                                       if 'medical' in f.get('field_name', '').lower() or 
+                                          'patient' in f.get('table_name', '').lower()]
                 
-                if healthcare_fields:
-                    hipaa_classified = [f for f in healthcare_fields 
-                                      if 'HIPAA' in f.get('applicable_regulations', [])]
-                    if hipaa_classified:
-                        print("✅ Healthcare context correctly identified for HIPAA classification")
-                    else:
-                        print("⚠️ Healthcare fields not classified as HIPAA")
+                    if healthcare_fields:
+                        hipaa_classified = [f for f in healthcare_fields 
+                                          if 'HIPAA' in f.get('applicable_regulations', [])]
+                        if hipaa_classified:
+                            print("✅ Healthcare context correctly identified for HIPAA classification")
+                        else:
+                            print("⚠️ Healthcare fields not classified as HIPAA")
                 
-                return True
+                    return True
                 
-            else:
-                print(f"❌ Classification Failed: HTTP {response.status_code}")
-                print(f"Response: {response.text}")
-                return False
+                else:
+                    print(f"❌ Classification Failed: HTTP {response.status_code}")
+                    print(f"Response: {response.text}")
+                    return False
+            finally:
+                response.close()
                 
         except Exception as e:
             print(f"❌ Classification Error: {str(e)}")
             return False
 
+    def test_classification_concurrency(self, request_count: int = 32) -> bool:
+        """Fan out concurrent classify requests and report client-side latency percentiles"""
+        print(f"🚦 Testing Classification Under Load ({request_count} concurrent requests)...")
+        
+        # Distinct session ids and rotated field orders, so no two requests are identical
+        field_count = len(_SAMPLE_FIELDS)
+        # Bodies are encoded up front so the workers only send bytes
+        requests_to_send = [
+            _dumps({
+                "session_id": f"load-test-session-{i}",
+                "selected_fields": _SAMPLE_FIELDS[i % field_count:] + _SAMPLE_FIELDS[:i % field_count],
+                "regulations": ["HIPAA", "GDPR"]
+            })
+            for i in range(request_count)
+        ]
+        
+        # Latencies are integer nanoseconds from the monotonic clock
+        def classify_once(body: bytes):
+            start_time = time.perf_counter_ns()
+            try:
+                response = self._post_body(self.client, f"{self.api_base}/classify", body, timeout=30)
+            except Exception as e:
+                return False, time.perf_counter_ns() - start_time, str(e)
+            request_time = time.perf_counter_ns() - start_time
+            if response.status_code != 200:
+                return False, request_time, f"HTTP {response.status_code}"
+            return True, request_time, _json(response).get('processing_time')
+        
+        try:
+            start_time = time.perf_counter_ns()
+            with ThreadPoolExecutor(max_workers=request_count) as executor:
+                outcomes = list(executor.map(classify_once, requests_to_send))
+            wall_time = (time.perf_counter_ns() - start_time) / 1e9
+            
+            latencies = sorted(request_time for _, request_time, _ in outcomes)
+            failures = [detail for ok, _, detail in outcomes if not ok]
+            
+            print(f"⏱️ {request_count} requests completed in {wall_time:.3f}s")
+            print(f"   Latency p50: {_percentile(latencies, 0.50) / 1e9:.3f}s")
+            print(f"   Latency p95: {_percentile(latencies, 0.95) / 1e9:.3f}s")
+            print(f"   Latency max: {latencies[-1] / 1e9:.3f}s")
+            
+            server_times = [detail for ok, _, detail in outcomes if ok and detail]
+            if server_times:
+                print(f"   Server processing times (first 5): {server_times[:5]}")
+            
+            if failures:
+                print(f"❌ {len(failures)} requests failed: {failures[:5]}")
+                return False
+            
+            print("✅ All concurrent classification requests succeeded")
+            return True
+            
+        except Exception as e:
+            print(f"❌ Load Test Error: {str(e)}")
+            return False
+
     def test_error_handling_logging(self) -> bool:
         """Test error handling and logging"""
         print("💥 Testing Error Handling and Logging...")
         
         try:
             # Test with invalid session ID
-            invalid_request = {
-                "session_id": "invalid-session-999",
-                "selected_fields": [
-                    {"table_name": "test", "column_name": "test_field", "data_type": "VARCHAR"}
-                ],
-                "regulations": ["HIPAA"]
-            }
-            
-            start_time = time.time()
-            response = self.session.post(
+            start_time = time.perf_counter_ns()
+            response = self._post_body(
+                self.client,
                 f"{self.api_base}/classify",
-                json=invalid_request,
+                _INVALID_CLASSIFY_BODY,
                 timeout=10
             )
-            request_time = time.time() - start_time
+            request_time = (time.perf_counter_ns() - start_time) / 1e9
             
             print(f"⏱️ Error handling test completed in {request_time:.3f}s")
             
@@ -248,7 +444,7 @@ class EnhancedLoggingTester:
         print("🚀 Starting Enhanced Logging Integration Test")
         print("=" * 60)
         
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         test_results = {
             'health_endpoint': False,
             'classification_endpoint': False,
@@ -257,32 +453,44 @@ class EnhancedLoggingTester:
             'overall_success': False
         }
         
-        # 1. Test health endpoint logging
-        test_results['health_endpoint'] = self.test_health_endpoint_logging()
-        print()
-        
-        # 2. Test classification endpoint logging
-        test_results['classification_endpoint'] = self.test_classification_endpoint_logging()
-        print()
-        
-        # 3. Test error handling logging
-        test_results['error_handling'] = self.test_error_handling_logging()
-        print()
+        # 1-3. The HTTP probes are independent, so overlap them; wall time tracks the slowest.
+        # Each probe's output is captured and printed in order once it completes
+        probes = [
+            ('health_endpoint', self.test_health_endpoint_logging),
+            ('classification_endpoint', self.test_classification_endpoint_logging),
+            ('error_handling', self.test_error_handling_logging)
+        ]
+        output = _ThreadOutput(sys.stdout)
+        sys.stdout = output
+        try:
+            with ThreadPoolExecutor(max_workers=len(probes)) as executor:
+                futures = [(name, executor.submit(output.run, probe)) for name, probe in probes]
+                for name, future in futures:
+                    test_results[name], probe_output = future.result()
+                    output.stream.write(probe_output + "\n")
+        finally:
+            sys.stdout = output.stream
         
-        # 4. Verify backend logs
+        # 4. Verify logging output
         test_results['log_verification'] = self.verify_backend_logs()
         print()
         
+        # Optional load test: LOGGING_LOAD_REQUESTS=32 fans out that many concurrent classify calls
+        load_requests = int(os.environ.get('LOGGING_LOAD_REQUESTS', '0'))
+        if load_requests > 0:
+            test_results['classification_concurrency'] = self.test_classification_concurrency(load_requests)
+            print()
+        
         # Calculate overall results
-        end_time = time.time()
-        test_duration = end_time - start_time
+        test_duration = (time.perf_counter_ns() - start_time) / 1e9
         
         # Determine overall success
         test_results['overall_success'] = all([
             test_results['health_endpoint'],
             test_results['classification_endpoint'],
             test_results['error_handling'],
-            test_results['log_verification']
+            test_results['log_verification'],
+            test_results.get('classification_concurrency', True)
         ])
         
         # Print summary
@@ -312,7 +520,10 @@ class EnhancedLoggingTester:
 def main():
     """Main test execution function"""
     tester = EnhancedLoggingTester()
-    results = tester.run_comprehensive_logging_test()
+    try:
+        results = tester.run_comprehensive_logging_test()
+    finally:
+        tester.close()
     
     # Return exit code based on results
     if results['overall_success']:
@@ -3,15 +3,23 @@ PII Scanner POC Package
 Enterprise-grade PII/PHI detection and classification system
 """
 
+import importlib
+
 __version__ = "2.0.0"
 __author__ = "PII Scanner Team"
 __description__ = "Enterprise PII/PHI Scanner with Enhanced Regulatory Compliance"
 
-# Package-level imports for easy access
-from .core.pii_scanner_facade import PIIScannerFacade
-from .core.hybrid_classification_orchestrator import HybridClassificationOrchestrator
-from .models.data_models import PIIType, RiskLevel, Regulation, ColumnMetadata
-from .services.database_service import DatabaseService
+# Package-level names for easy access, imported on first use (PEP 562) so that
+# importing the package, or one of its submodules, does not load the whole stack
+_LAZY_IMPORTS = {
+    'PIIScannerFacade': 'pii_scanner_poc.core.pii_scanner_facade',
+    'HybridClassificationOrchestrator': 'pii_scanner_poc.core.hybrid_classification_orchestrator',
+    'PIIType': 'pii_scanner_poc.models.data_models',
+    'RiskLevel': 'pii_scanner_poc.models.data_models',
+    'Regulation': 'pii_scanner_poc.models.data_models',
+    'ColumnMetadata': 'pii_scanner_poc.models.data_models',
+    'DatabaseService': 'pii_scanner_poc.services.database_service'
+}
 
 __all__ = [
     'PIIScannerFacade',
@@ -21,4 +29,17 @@ __all__ = [
     'Regulation',
     'ColumnMetadata',
     'DatabaseService'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value  # Later lookups bypass __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
@@ -7,6 +7,11 @@ Command-line interface for managing the local alias and pattern database
 import sys
 import json
 import csv
+import hashlib
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Any
@@ -15,7 +20,11 @@ from typing import Dict, List, Any
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 try:
-    from pii_scanner_poc.services.local_alias_database import alias_database, FieldAlias, LearningRecord
+    import orjson                   # Fast JSON encoding for stats --json
+except ImportError:
+    orjson = None                   # Fall back to the stdlib json module
+
+try:
     from pii_scanner_poc.models.data_models import PIIType, RiskLevel, Regulation
 except ImportError as e:
     print(f"❌ Error importing modules: {e}")
@@ -23,11 +32,94 @@ except ImportError as e:
     sys.exit(1)
 
 
+@lru_cache(maxsize=None)
+def _alias_db_module():
+    """Import the alias database module on first use; opening it creates the SQLite database,
+    which help and argument errors never need"""
+    try:
+        from pii_scanner_poc.services import local_alias_database
+    except ImportError as e:
+        print(f"❌ Error importing modules: {e}")
+        print("Make sure you're running from the correct directory")
+        sys.exit(1)
+    return local_alias_database
+
+
+# Rows handed to bulk_import_aliases at a time; keeps CSV imports at bounded memory
+IMPORT_CHUNK_SIZE = 1000
+
+# Chunks queued for the background import writer before parsing waits. There is a single writer:
+# rows use INSERT OR REPLACE, so chunks must land in file order for the last duplicate to win,
+# and the database serialises writes anyway. The gain is overlapping CSV parsing with inserts.
+IMPORT_MAX_PENDING = 2
+
+# Defaults for options left unset on the command line
+_DEFAULT_STATUS = 'pending'
+_DEFAULT_CREATOR = 'cli'
+_DEFAULT_IMPORT_CREATOR = 'csv_import'
+_DEFAULT_RISK = 'MEDIUM'
+_DEFAULT_REG = 'GDPR'
+_DEFAULT_SCHEMA = 'unknown'
+_DEFAULT_METHOD = 'LOCAL_PATTERN'
+
+# CSV import columns and the value used when a column is absent from the file
+_IMPORT_COLUMNS = (
+    ('alias_name', ''),
+    ('standard_field_name', ''),
+    ('pii_type', 'OTHER'),
+    ('risk_level', _DEFAULT_RISK),
+    ('confidence_score', '0.8'),
+    ('regulations', _DEFAULT_REG)
+)
+
+# Enum members keyed by both name and value, so "EMAIL" and "Email" resolve alike with one dict hit
+_PII_TYPES = {**{m.value: m for m in PIIType}, **{m.name: m for m in PIIType}}
+_RISK_LEVELS = {**{m.value: m for m in RiskLevel}, **{m.name: m for m in RiskLevel}}
+_REGULATIONS = {**{m.value: m for m in Regulation}, **{m.name: m for m in Regulation}}
+
+
+# Columns shown by list-aliases, fetched as parallel lists, and the row layout they are formatted with
+_LIST_COLUMNS = ('alias_name', 'pii_type', 'risk_level', 'confidence_score', 'validation_status', 'company_id')
+_ALIAS_ROW_FORMAT = "{:<25} {:<12} {:<8} {:<10.2f} {:<10} {:<12}"
+
+
+# Seconds a stats aggregate is reused before the database is queried again
+STATS_CACHE_TTL = 30
+
+
+@lru_cache(maxsize=8)
+def _cached_stats(db, ttl_bucket: int) -> Dict[str, Any]:
+    """Aggregate statistics for db, memoised per TTL bucket (callers pass time // STATS_CACHE_TTL)"""
+    return db.get_performance_statistics()
+
+
+def _dumps(payload: Any) -> str:
+    """Encode payload as indented JSON, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(payload, indent=2)
+
+
+def _lookup(members: Dict[str, Any], enum_cls: type, key: str) -> Any:
+    """Resolve an enum member by name or value, raising ValueError like the Enum constructor"""
+    member = members.get(key)
+    if member is None:
+        raise ValueError(f"{key!r} is not a valid {enum_cls.__name__}")
+    return member
+
+
 class AliasManagementCLI:
     """Command-line interface for alias database management"""
     
     def __init__(self):
-        self.db = alias_database
+        self._db = None
+    
+    @property
+    def db(self):
+        """Shared alias database, opened on first access"""
+        if self._db is None:
+            self._db = _alias_db_module().alias_database
+        return self._db
     
     def show_help(self):
         """Display help information"""
@@ -65,22 +157,27 @@ For detailed help on a specific command, use:
             return
         
         try:
-            # Generate alias ID
-            import hashlib
-            alias_id = hashlib.md5(f"{args.field_name}_{args.pii_type}".encode()).hexdigest()[:16]
+            pii_type = _lookup(_PII_TYPES, PIIType, args.pii_type)
+            
+            # Generate alias ID; stays MD5-derived so re-adding an alias replaces the row written
+            # by earlier runs or by bulk_import_aliases, which derives the same ID. Both hash the
+            # enum value, so "EMAIL" and "Email" give one ID
+            alias_id = hashlib.md5(f"{args.field_name}_{pii_type.value}".encode()).hexdigest()[:16]
             
-            alias = FieldAlias(
+            alias = _alias_db_module().FieldAlias(
                 alias_id=alias_id,
                 standard_field_name=args.pii_type.lower(),
                 alias_name=args.field_name.lower(),
                 confidence_score=float(args.confidence or 0.8),
-                pii_type=PIIType(args.pii_type),
-                risk_level=RiskLevel(args.risk_level or "MEDIUM"),
-                applicable_regulations=[Regulation(reg) for reg in (args.regulations or ["GDPR"]).split(",")],
+                pii_type=pii_type,
+                risk_level=_lookup(_RISK_LEVELS, RiskLevel, args.risk_level or _DEFAULT_RISK),
+                applicable_regulations=[
+                    _lookup(_REGULATIONS, Regulation, reg) for reg in (args.regulations or _DEFAULT_REG).split(",")
+                ],
                 company_id=args.company,
                 region=args.region,
-                validation_status=args.status or "pending",
-                created_by=args.created_by or "cli"
+                validation_status=args.status or _DEFAULT_STATUS,
+                created_by=args.created_by or _DEFAULT_CREATOR
             )
             
             if self.db.add_field_alias(alias):
@@ -97,31 +194,36 @@ For detailed help on a specific command, use:
         print("-" * 80)
         
         try:
-            aliases = self.db.export_aliases(
+            columns = self.db.export_alias_columns(
+                _LIST_COLUMNS,
                 company_id=args.company,
                 validation_status=args.status or "approved"
             )
+            total = len(columns['alias_name'])
             
-            if not aliases:
+            if not total:
                 print("No aliases found matching criteria")
                 return
             
-            # Display aliases in table format
-            print(f"{'Alias Name':<25} {'PII Type':<12} {'Risk':<8} {'Confidence':<10} {'Status':<10} {'Company':<12}")
-            print("-" * 80)
+            # Display aliases in table format; the table is written to stdout in one call
+            lines = [
+                f"{'Alias Name':<25} {'PII Type':<12} {'Risk':<8} {'Confidence':<10} {'Status':<10} {'Company':<12}",
+                "-" * 80
+            ]
+            format_row = _ALIAS_ROW_FORMAT.format
             
-            for alias in aliases[:50]:  # Limit to 50 for readability
-                print(f"{alias['alias_name']:<25} "
-                      f"{alias['pii_type']:<12} "
-                      f"{alias['risk_level']:<8} "
-                      f"{alias['confidence_score']:<10.2f} "
-                      f"{alias['validation_status']:<10} "
-                      f"{alias['company_id'] or 'global':<12}")
+            # Limit to 50 for readability; each column is sliced once and the rows zipped back together
+            lines.extend(
+                format_row(name, pii_type, risk, confidence, status, company or 'global')
+                for name, pii_type, risk, confidence, status, company
+                in zip(*(columns[column][:50] for column in _LIST_COLUMNS))
+            )
             
-            if len(aliases) > 50:
-                print(f"\n... and {len(aliases) - 50} more aliases")
+            if total > 50:
+                lines.append(f"\n... and {total - 50} more aliases")
             
-            print(f"\nTotal: {len(aliases)} aliases")
+            lines.append(f"\nTotal: {total} aliases\n")
+            sys.stdout.write("\n".join(lines))
             
         except Exception as e:
             print(f"❌ Error listing aliases: {e}")
@@ -137,25 +239,88 @@ For detailed help on a specific command, use:
             print(f"❌ File not found: {csv_file}")
             return
         
-        try:
-            aliases_data = []
-            with open(csv_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
+        def read_rows():
+            # Rows are parsed lazily, so only one chunk is held in memory at a time
+            split = str.split
+            pii_types = _PII_TYPES
+            risk_levels = _RISK_LEVELS
+            with open(csv_file, 'r', encoding='utf-8', newline='', buffering=1 << 20) as f:
+                reader = csv.reader(f)
+                header = next(reader, None)
+                if header is None:
+                    return
+                
+                # Resolve each column's position once; absent columns (None) take their default
+                positions = {name: index for index, name in enumerate(header)}
+                columns = [(positions.get(name), default) for name, default in _IMPORT_COLUMNS]
+                
                 for row in reader:
-                    aliases_data.append({
-                        'alias_name': row.get('alias_name', ''),
-                        'standard_field_name': row.get('standard_field_name', ''),
-                        'pii_type': row.get('pii_type', 'OTHER'),
-                        'risk_level': row.get('risk_level', 'MEDIUM'),
-                        'confidence_score': row.get('confidence_score', '0.8'),
-                        'regulations': row.get('regulations', 'GDPR').split(',')
-                    })
+                    if not row:
+                        continue  # Blank line, skipped as DictReader did
+                    width = len(row)
+                    alias_name, standard_field_name, pii_type, risk_level, confidence_score, regulations = [
+                        row[index] if index is not None and index < width else default
+                        for index, default in columns
+                    ]
+                    # Names such as EMAIL are mapped to the enum value the database expects;
+                    # unknown strings pass through so the row is reported as an import error
+                    pii_member = pii_types.get(pii_type)
+                    risk_member = risk_levels.get(risk_level)
+                    yield {
+                        'alias_name': alias_name,
+                        'standard_field_name': standard_field_name,
+                        'pii_type': pii_member.value if pii_member else pii_type,
+                        'risk_level': risk_member.value if risk_member else risk_level,
+                        'confidence_score': confidence_score,
+                        'regulations': split(regulations, ',')
+                    }
+        
+        try:
+            results = {'imported': 0, 'skipped': 0, 'errors': 0}
+            created_by = args.created_by or _DEFAULT_IMPORT_CREATOR
+            buffer = []
+            executor = None if getattr(args, 'no_parallel', False) else ThreadPoolExecutor(max_workers=1)
+            pending = deque()
             
-            results = self.db.bulk_import_aliases(
-                aliases_data, 
-                company_id=args.company,
-                created_by=args.created_by or "csv_import"
-            )
+            def merge(chunk_results):
+                for key in results:
+                    results[key] += chunk_results[key]
+            
+            def flush():
+                nonlocal buffer
+                if executor is None:
+                    merge(self.db.bulk_import_aliases(
+                        buffer, 
+                        company_id=args.company,
+                        created_by=created_by
+                    ))
+                    # Empty the same list in place so at most one chunk of rows is alive at a time
+                    buffer.clear()
+                    return
+                
+                # The submitted chunk belongs to the writer now, so parsing continues into a fresh list
+                pending.append(executor.submit(
+                    self.db.bulk_import_aliases,
+                    buffer,
+                    company_id=args.company,
+                    created_by=created_by
+                ))
+                buffer = []
+                while len(pending) > IMPORT_MAX_PENDING:
+                    merge(pending.popleft().result())
+            
+            try:
+                for row in read_rows():
+                    buffer.append(row)
+                    if len(buffer) >= IMPORT_CHUNK_SIZE:
+                        flush()
+                if buffer:
+                    flush()
+                while pending:
+                    merge(pending.popleft().result())
+            finally:
+                if executor is not None:
+                    executor.shutdown(wait=True)
             
             print(f"✅ Import completed:")
             print(f"   Imported: {results['imported']}")
@@ -179,31 +344,35 @@ For detailed help on a specific command, use:
                 print("No aliases to export")
                 return
             
-            with open(output_file, 'w', newline='', encoding='utf-8') as f:
+            # Large write buffer: rows are flushed in big blocks rather than per line
+            with open(output_file, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
                 fieldnames = [
                     'alias_name', 'standard_field_name', 'pii_type', 'risk_level',
                     'confidence_score', 'applicable_regulations', 'company_id',
                     'region', 'validation_status', 'created_date', 'usage_count'
                 ]
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
+                writer = csv.writer(f)
+                writer.writerow(fieldnames)
                 
-                for alias in aliases:
-                    # Flatten the data for CSV
-                    row = {
-                        'alias_name': alias['alias_name'],
-                        'standard_field_name': alias['standard_field_name'],
-                        'pii_type': alias['pii_type'],
-                        'risk_level': alias['risk_level'],
-                        'confidence_score': alias['confidence_score'],
-                        'applicable_regulations': ','.join(alias['applicable_regulations']),
-                        'company_id': alias['company_id'] or '',
-                        'region': alias['region'] or '',
-                        'validation_status': alias['validation_status'],
-                        'created_date': alias['created_date'],
-                        'usage_count': alias['usage_count']
-                    }
-                    writer.writerow(row)
+                join_regulations = ','.join
+                
+                # Flatten the data for CSV as tuples in fieldnames order; all rows go to the writer in one call
+                writer.writerows(
+                    (
+                        alias['alias_name'],
+                        alias['standard_field_name'],
+                        alias['pii_type'],
+                        alias['risk_level'],
+                        alias['confidence_score'],
+                        join_regulations(alias['applicable_regulations']),
+                        alias['company_id'] or '',
+                        alias['region'] or '',
+                        alias['validation_status'],
+                        alias['created_date'],
+                        alias['usage_count']
+                    )
+                    for alias in aliases
+                )
             
             print(f"✅ Exported {len(aliases)} aliases to: {output_file}")
             
@@ -226,7 +395,14 @@ For detailed help on a specific command, use:
     def show_stats(self, args):
         """Show database statistics"""
         try:
-            stats = self.db.get_performance_statistics()
+            if getattr(args, 'no_cache', False):
+                stats = self.db.get_performance_statistics()
+            else:
+                stats = _cached_stats(self.db, int(time.time() // STATS_CACHE_TTL))
+
+            if getattr(args, 'json', False):
+                sys.stdout.write(_dumps(stats) + "\n")
+                return
 
             print("\n📊 Alias Database Statistics")
             print("=" * 50)
@@ -320,18 +496,20 @@ For detailed help on a specific command, use:
             return
         
         try:
-            import hashlib
-            record_id = hashlib.md5(f"{args.field_name}_{args.table_name}_{datetime.now().isoformat()}".encode()).hexdigest()[:16]
+            record_id = hashlib.blake2b(
+                f"{args.field_name}_{args.table_name}_{datetime.now().isoformat()}".encode(),
+                digest_size=8
+            ).hexdigest()
             
-            record = LearningRecord(
+            record = _alias_db_module().LearningRecord(
                 record_id=record_id,
                 field_name=args.field_name,
                 table_name=args.table_name,
-                schema_name=args.schema_name or "unknown",
-                detected_pii_type=PIIType(args.detected_type),
-                actual_pii_type=PIIType(args.actual_type),
+                schema_name=args.schema_name or _DEFAULT_SCHEMA,
+                detected_pii_type=_lookup(_PII_TYPES, PIIType, args.detected_type),
+                actual_pii_type=_lookup(_PII_TYPES, PIIType, args.actual_type),
                 confidence_score=float(args.confidence or 0.5),
-                detection_method=args.method or "LOCAL_PATTERN",
+                detection_method=args.method or _DEFAULT_METHOD,
                 user_feedback=args.feedback or "",
                 is_correct=args.detected_type == args.actual_type
             )
@@ -345,8 +523,12 @@ For detailed help on a specific command, use:
             print(f"❌ Error adding feedback: {e}")
 
 
-def main():
-    """Main CLI execution"""
+# Argument parser, built on the first command that needs one and reused by later main() calls
+_PARSER = None
+
+
+def _build_parser():
+    """Build the argument parser with one subparser per command"""
     import argparse
     
     parser = argparse.ArgumentParser(description="Alias Database Management CLI")
@@ -374,6 +556,7 @@ def main():
     import_parser.add_argument('--file', required=True, help='CSV file path')
     import_parser.add_argument('--company', help='Company ID for imported aliases')
     import_parser.add_argument('--created-by', help='Creator name')
+    import_parser.add_argument('--no-parallel', action='store_true', help='Write chunks on the main thread instead of a background writer')
     
     # Export CSV command
     export_parser = subparsers.add_parser('export-csv', help='Export aliases to CSV')
@@ -387,7 +570,9 @@ def main():
     approve_parser.add_argument('--alias-ids', help='Comma-separated alias IDs (leave empty for all)')
     
     # Stats command
-    subparsers.add_parser('stats', help='Show database statistics')
+    stats_parser = subparsers.add_parser('stats', help='Show database statistics')
+    stats_parser.add_argument('--no-cache', action='store_true', help='Recompute statistics instead of reusing recent results')
+    stats_parser.add_argument('--json', action='store_true', help='Print statistics as JSON')
     
     # Search command
     search_parser = subparsers.add_parser('search', help='Search aliases')
@@ -414,11 +599,25 @@ def main():
     # Help command
     subparsers.add_parser('help', help='Show help information')
     
-    args = parser.parse_args()
+    return parser
+
+
+def main():
+    """Main CLI execution"""
+    global _PARSER
+    
+    # Help needs neither argparse nor the database, so answer it before building the parser
+    if len(sys.argv) < 2 or sys.argv[1] in ('help', '-h', '--help'):
+        AliasManagementCLI().show_help()
+        return
+    
+    if _PARSER is None:
+        _PARSER = _build_parser()
+    args = _PARSER.parse_args()
     
     if not args.command or args.command == 'help':
-        cli = AliasManagementCLI()
-        cli.show_help()
+        # show_help never touches the database, so help does not open it
+        AliasManagementCLI().show_help()
         return
     
     try:
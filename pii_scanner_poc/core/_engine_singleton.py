@@ -0,0 +1,21 @@
+"""
+Shared In-House Classification Engine
+=====================================
+
+Scripts and tools that classify fields directly should share one warmed
+InHouseClassificationEngine rather than bootstrapping their own: building an
+engine loads the regulatory pattern databases and compiles every regex.
+
+The engine module already creates one instance at import time, so that
+instance is the one handed out here.
+"""
+
+from pii_scanner_poc.core.inhouse_classification_engine import (
+    InHouseClassificationEngine,
+    _classification_engine
+)
+
+
+def get_engine() -> InHouseClassificationEngine:
+    """Return the process-wide classification engine"""
+    return _classification_engine
@@ -27,9 +27,11 @@ Last Updated: 2024-12-29
 
 # Standard library imports
 import re
+import sys
 import json
 import time
 from typing import Dict, List, Optional, Set, Tuple, Any
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from difflib import SequenceMatcher
 from datetime import datetime
@@ -45,6 +47,272 @@ from pii_scanner_poc.utils.logging_config import main_logger
 from pii_scanner_poc.core.regulatory_pattern_loader import regulatory_loader
 
 
+# Substring keyword tables. Dict order is match priority: when a field name
+# contains several keywords, the one declared first wins.
+_PARTIAL_PII_PATTERNS = {
+    'email': (PIIType.EMAIL, RiskLevel.HIGH, 0.92),
+    'phone': (PIIType.PHONE, RiskLevel.HIGH, 0.90),
+    'address': (PIIType.ADDRESS, RiskLevel.HIGH, 0.88),
+    'name': (PIIType.NAME, RiskLevel.HIGH, 0.85),
+    'password': (PIIType.OTHER, RiskLevel.HIGH, 0.90),
+}
+
+_MEDIUM_CONFIDENCE_PATTERNS = {
+    # Employee and HR related (70-75% confidence)
+    'employee': (PIIType.OTHER, RiskLevel.MEDIUM, 0.75),
+    'staff': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
+    'worker': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
+    'hire': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
+    'salary': (PIIType.FINANCIAL, RiskLevel.HIGH, 0.80),
+    'wage': (PIIType.FINANCIAL, RiskLevel.HIGH, 0.80),
+    'compensation': (PIIType.FINANCIAL, RiskLevel.HIGH, 0.85),
+    'bonus': (PIIType.FINANCIAL, RiskLevel.HIGH, 0.80),
+    'commission': (PIIType.FINANCIAL, RiskLevel.HIGH, 0.80),
+    'manager': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
+    'supervisor': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
+    'department': (PIIType.OTHER, RiskLevel.MEDIUM, 0.60),
+    'job': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
+    'position': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
+    'role': (PIIType.OTHER, RiskLevel.MEDIUM, 0.60),
+    'title': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
+    'designation': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
+    'level': (PIIType.OTHER, RiskLevel.MEDIUM, 0.55),
+    'grade': (PIIType.OTHER, RiskLevel.MEDIUM, 0.60),
+    'rank': (PIIType.OTHER, RiskLevel.MEDIUM, 0.60),
+    'badge': (PIIType.ID, RiskLevel.MEDIUM, 0.70),
+    
+    # Company and business (60-75% confidence)
+    'company': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
+    'organization': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
+    'business': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
+    'client': (PIIType.OTHER, RiskLevel.MEDIUM, 0.75),
+    'customer': (PIIType.OTHER, RiskLevel.MEDIUM, 0.75),
+    'vendor': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
+    'supplier': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
+    'partner': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
+    'agency': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
+    'firm': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
+    'corp': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
+    'enterprise': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
+    
+    # Financial and transaction (75-85% confidence)
+    'account': (PIIType.FINANCIAL, RiskLevel.HIGH, 0.85),
+    'transaction': (PIIType.FINANCIAL, RiskLevel.HIGH, 0.80),
+    'invoice': (PIIType.FINANCIAL, RiskLevel.MEDIUM, 0.75),
+    'payment': (PIIType.FINANCIAL, RiskLevel.HIGH, 0.85),
+    'billing': (PIIType.FINANCIAL, RiskLevel.HIGH, 0.85),
+    'purchase': (PIIType.FINANCIAL, RiskLevel.MEDIUM, 0.75),
+    'order': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
+    'receipt': (PIIType.FINANCIAL, RiskLevel.MEDIUM, 0.75),
+    'contract': (PIIType.OTHER, RiskLevel.MEDIUM, 0.75),
+    'agreement': (PIIType.OTHER, RiskLevel.MEDIUM, 0.75),
+    'deal': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
+    'opportunity': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
+    'quote': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
+    'estimate': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
+    'cost': (PIIType.FINANCIAL, RiskLevel.MEDIUM, 0.70),
+    'price': (PIIType.FINANCIAL, RiskLevel.MEDIUM, 0.70),
+    'amount': (PIIType.FINANCIAL, RiskLevel.MEDIUM, 0.65),
+    'value': (PIIType.OTHER, RiskLevel.MEDIUM, 0.55),
+    'fee': (PIIType.FINANCIAL, RiskLevel.MEDIUM, 0.70),
+    'rate': (PIIType.FINANCIAL, RiskLevel.MEDIUM, 0.70),
+    'discount': (PIIType.FINANCIAL, RiskLevel.MEDIUM, 0.70),
+    'tax': (PIIType.FINANCIAL, RiskLevel.MEDIUM, 0.75),
+    'total': (PIIType.FINANCIAL, RiskLevel.MEDIUM, 0.60),
+    'subtotal': (PIIType.FINANCIAL, RiskLevel.MEDIUM, 0.65),
+    'balance': (PIIType.FINANCIAL, RiskLevel.MEDIUM, 0.75),
+    'credit': (PIIType.FINANCIAL, RiskLevel.MEDIUM, 0.75),
+    'debit': (PIIType.FINANCIAL, RiskLevel.MEDIUM, 0.75),
+    
+    # Authentication and security (80-85% confidence)
+    'login': (PIIType.ID, RiskLevel.HIGH, 0.85),
+    'auth': (PIIType.ID, RiskLevel.HIGH, 0.85),
+    'token': (PIIType.ID, RiskLevel.HIGH, 0.80),
+    'session': (PIIType.ID, RiskLevel.HIGH, 0.80),
+    'credential': (PIIType.ID, RiskLevel.HIGH, 0.85),
+    'key': (PIIType.ID, RiskLevel.MEDIUM, 0.60),  # Could be technical
+    'secret': (PIIType.ID, RiskLevel.HIGH, 0.85),
+    'permission': (PIIType.OTHER, RiskLevel.MEDIUM, 0.60),
+    'access': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
+    'privilege': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
+    'grant': (PIIType.OTHER, RiskLevel.MEDIUM, 0.60),
+    
+    # Location related (70-80% confidence)
+    'location': (PIIType.ADDRESS, RiskLevel.MEDIUM, 0.75),
+    'place': (PIIType.ADDRESS, RiskLevel.MEDIUM, 0.70),
+    'region': (PIIType.ADDRESS, RiskLevel.MEDIUM, 0.70),
+    'territory': (PIIType.ADDRESS, RiskLevel.MEDIUM, 0.70),
+    'area': (PIIType.ADDRESS, RiskLevel.MEDIUM, 0.65),
+    'zone': (PIIType.ADDRESS, RiskLevel.MEDIUM, 0.65),
+    'district': (PIIType.ADDRESS, RiskLevel.MEDIUM, 0.70),
+    'county': (PIIType.ADDRESS, RiskLevel.MEDIUM, 0.75),
+    'province': (PIIType.ADDRESS, RiskLevel.MEDIUM, 0.75),
+    'country': (PIIType.ADDRESS, RiskLevel.MEDIUM, 0.80),
+    'nation': (PIIType.ADDRESS, RiskLevel.MEDIUM, 0.75),
+    'continent': (PIIType.ADDRESS, RiskLevel.MEDIUM, 0.70),
+    'latitude': (PIIType.ADDRESS, RiskLevel.HIGH, 0.90),
+    'longitude': (PIIType.ADDRESS, RiskLevel.HIGH, 0.90),
+    'coordinate': (PIIType.ADDRESS, RiskLevel.HIGH, 0.85),
+    'geo': (PIIType.ADDRESS, RiskLevel.MEDIUM, 0.75),
+    'timezone': (PIIType.ADDRESS, RiskLevel.MEDIUM, 0.70),
+    'locale': (PIIType.ADDRESS, RiskLevel.MEDIUM, 0.65),
+    
+    # Project and work related (60-70% confidence)
+    'project': (PIIType.OTHER, RiskLevel.LOW, 0.60),
+    'task': (PIIType.OTHER, RiskLevel.LOW, 0.55),
+    'activity': (PIIType.OTHER, RiskLevel.LOW, 0.55),
+    'assignment': (PIIType.OTHER, RiskLevel.LOW, 0.60),
+    'milestone': (PIIType.OTHER, RiskLevel.LOW, 0.55),
+    'deadline': (PIIType.OTHER, RiskLevel.LOW, 0.55),
+    'schedule': (PIIType.OTHER, RiskLevel.LOW, 0.60),
+    'plan': (PIIType.OTHER, RiskLevel.LOW, 0.55),
+    'timeline': (PIIType.OTHER, RiskLevel.LOW, 0.55),
+    'phase': (PIIType.OTHER, RiskLevel.LOW, 0.55),
+    'stage': (PIIType.OTHER, RiskLevel.LOW, 0.55),
+    'step': (PIIType.OTHER, RiskLevel.LOW, 0.55),
+    'sprint': (PIIType.OTHER, RiskLevel.LOW, 0.60),
+    'iteration': (PIIType.OTHER, RiskLevel.LOW, 0.55),
+    'release': (PIIType.OTHER, RiskLevel.LOW, 0.55),
+    'version': (PIIType.OTHER, RiskLevel.LOW, 0.50),
+    
+    # Communication related (65-75% confidence)
+    'message': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
+    'comment': (PIIType.OTHER, RiskLevel.MEDIUM, 0.60),
+    'note': (PIIType.OTHER, RiskLevel.MEDIUM, 0.60),
+    'remark': (PIIType.OTHER, RiskLevel.MEDIUM, 0.60),
+    'feedback': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
+    'review': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
+    'rating': (PIIType.OTHER, RiskLevel.MEDIUM, 0.60),
+    'score': (PIIType.OTHER, RiskLevel.MEDIUM, 0.60),
+    'evaluation': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
+    'assessment': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
+    'survey': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
+    'poll': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
+    'questionnaire': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
+    'response': (PIIType.OTHER, RiskLevel.MEDIUM, 0.60),
+    'answer': (PIIType.OTHER, RiskLevel.MEDIUM, 0.60),
+    
+    # Personal and demographic (70-85% confidence)
+    'age': (PIIType.OTHER, RiskLevel.MEDIUM, 0.80),
+    'gender': (PIIType.OTHER, RiskLevel.MEDIUM, 0.75),
+    'sex': (PIIType.OTHER, RiskLevel.MEDIUM, 0.75),
+    'race': (PIIType.OTHER, RiskLevel.MEDIUM, 0.80),
+    'ethnicity': (PIIType.OTHER, RiskLevel.MEDIUM, 0.80),
+    'nationality': (PIIType.OTHER, RiskLevel.MEDIUM, 0.75),
+    'citizenship': (PIIType.OTHER, RiskLevel.MEDIUM, 0.80),
+    'marital': (PIIType.OTHER, RiskLevel.MEDIUM, 0.75),
+    'marriage': (PIIType.OTHER, RiskLevel.MEDIUM, 0.75),
+    'family': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
+    'relationship': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
+    'spouse': (PIIType.NAME, RiskLevel.MEDIUM, 0.80),
+    'partner': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),  # Also business context
+    'parent': (PIIType.NAME, RiskLevel.MEDIUM, 0.75),
+    'child': (PIIType.NAME, RiskLevel.MEDIUM, 0.75),
+    'children': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
+    'dependent': (PIIType.OTHER, RiskLevel.MEDIUM, 0.75),
+    'beneficiary': (PIIType.NAME, RiskLevel.MEDIUM, 0.80),
+    'emergency': (PIIType.NAME, RiskLevel.HIGH, 0.85),
+    'contact': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
+    'next_of_kin': (PIIType.NAME, RiskLevel.HIGH, 0.85),
+    
+    # Education and qualification (65-75% confidence)
+    'education': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
+    'school': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
+    'university': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
+    'college': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
+    'degree': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
+    'diploma': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
+    'certificate': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
+    'qualification': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
+    'skill': (PIIType.OTHER, RiskLevel.MEDIUM, 0.60),
+    'expertise': (PIIType.OTHER, RiskLevel.MEDIUM, 0.60),
+    'experience': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
+    'training': (PIIType.OTHER, RiskLevel.MEDIUM, 0.60),
+    'course': (PIIType.OTHER, RiskLevel.MEDIUM, 0.60),
+    'class': (PIIType.OTHER, RiskLevel.MEDIUM, 0.55),
+    'grade': (PIIType.OTHER, RiskLevel.MEDIUM, 0.60),
+    'gpa': (PIIType.OTHER, RiskLevel.MEDIUM, 0.75),
+    
+    # Health and medical (75-85% confidence) - not PHI but personal
+    'health': (PIIType.MEDICAL, RiskLevel.MEDIUM, 0.80),
+    'medical': (PIIType.MEDICAL, RiskLevel.HIGH, 0.85),
+    'insurance': (PIIType.ID, RiskLevel.MEDIUM, 0.80),
+    'policy': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
+    'claim': (PIIType.OTHER, RiskLevel.MEDIUM, 0.75),
+    'coverage': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
+    'benefit': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
+    'premium': (PIIType.FINANCIAL, RiskLevel.MEDIUM, 0.75),
+    'deductible': (PIIType.FINANCIAL, RiskLevel.MEDIUM, 0.75),
+    'copay': (PIIType.FINANCIAL, RiskLevel.MEDIUM, 0.75),
+    
+    # Names and identifiers with fuzzy matching (70-85% confidence)
+    'name': (PIIType.NAME, RiskLevel.MEDIUM, 0.75),
+    'identifier': (PIIType.ID, RiskLevel.MEDIUM, 0.70),
+    'code': (PIIType.OTHER, RiskLevel.LOW, 0.45),
+    'number': (PIIType.OTHER, RiskLevel.MEDIUM, 0.60),
+    'label': (PIIType.OTHER, RiskLevel.LOW, 0.40),
+    'tag': (PIIType.OTHER, RiskLevel.LOW, 0.45),
+    
+    # Technical but potentially personal (50-65% confidence)
+    'preference': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
+    'setting': (PIIType.OTHER, RiskLevel.LOW, 0.50),
+    'config': (PIIType.OTHER, RiskLevel.LOW, 0.45),
+    'option': (PIIType.OTHER, RiskLevel.LOW, 0.50),
+    'choice': (PIIType.OTHER, RiskLevel.LOW, 0.50),
+    'selection': (PIIType.OTHER, RiskLevel.LOW, 0.50),
+    'language': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
+    'locale': (PIIType.ADDRESS, RiskLevel.MEDIUM, 0.65),
+    'theme': (PIIType.OTHER, RiskLevel.LOW, 0.45),
+    'style': (PIIType.OTHER, RiskLevel.LOW, 0.45),
+    'format': (PIIType.OTHER, RiskLevel.LOW, 0.45),
+}
+
+
+# Exact names of purely technical/system fields that are never PII
+_TECHNICAL_FIELD_NAMES = frozenset({
+    # Database internal fields only
+    'uuid', 'guid', 'pk', 'fk', 'primary_key', 'foreign_key',
+    'created_at', 'updated_at', 'deleted_at', 'modified_at',
+    'created_by_id', 'updated_by_id', 'modified_by_id', 
+    'version_number', 'revision_number', 'sequence_number',
+    'row_number', 'auto_increment', 'identity_column',
+    
+    # System metadata only
+    'checksum', 'hash_value', 'md5_hash', 'sha1_hash', 'signature_hash',
+    'api_key', 'access_token', 'refresh_token', 'csrf_token', 'session_token',
+    'mime_type', 'content_type', 'file_size', 'encoding_type',
+    
+    # Clear technical identifiers
+    'request_id', 'job_id', 'batch_id', 'log_id', 'audit_id',
+    'trace_id', 'debug_id', 'error_code', 'warning_code',
+    
+    # File system fields only
+    'filename_only', 'file_extension', 'file_path', 'directory_path',
+    'file_size_bytes', 'last_modified_time'
+})
+
+
+def _compile_keyword_scan(keywords) -> re.Pattern:
+    """
+    Compile keywords into one zero-width alternation that reports, at every
+    position of the scanned string, the highest-priority keyword starting there.
+    Overlapping hits are all found in a single left-to-right pass.
+    """
+    return re.compile('(?=(%s))' % '|'.join(map(re.escape, keywords)))
+
+
+def _first_keyword(scan: re.Pattern, rank: Dict[str, int], text: str) -> Optional[str]:
+    """Return the highest-priority keyword contained in text, or None"""
+    hits = scan.findall(text)
+    return min(hits, key=rank.__getitem__) if hits else None
+
+
+_PARTIAL_KEYWORD_RANK = {key: i for i, key in enumerate(_PARTIAL_PII_PATTERNS)}
+_PARTIAL_KEYWORD_SCAN = _compile_keyword_scan(_PARTIAL_PII_PATTERNS)
+_MEDIUM_KEYWORD_RANK = {key: i for i, key in enumerate(_MEDIUM_CONFIDENCE_PATTERNS)}
+_MEDIUM_KEYWORD_SCAN = _compile_keyword_scan(_MEDIUM_CONFIDENCE_PATTERNS)
+
+
 class PatternLibrary:
     """
     Comprehensive Pattern Library for PII/PHI Detection
@@ -88,6 +356,9 @@ class PatternLibrary:
         self.regulatory_fields: Dict[str, Any] = {}
         self.alias_mappings: Dict[str, str] = {}
         
+        # Compiled regex alternations, built once per (pattern set, regulation)
+        self._combined_regex: Dict[Tuple[str, Regulation], Tuple[Optional[re.Pattern], Dict[str, SensitivityPattern]]] = {}
+        
         # Initialize all pattern libraries
         self._initialize_comprehensive_patterns()
         
@@ -436,6 +707,51 @@ class PatternLibrary:
             )
             self.regex_patterns.append(pattern)
     
+    def get_combined_regex(self, regulation: Regulation,
+                           source: str = 'regex') -> Tuple[Optional[re.Pattern], Dict[str, SensitivityPattern]]:
+        """
+        Get one compiled alternation covering every regex pattern for a regulation.
+        
+        Each pattern becomes a named group ``g<i>`` in declaration order, so a single
+        ``match`` returns the same pattern the sequential loop would have picked first;
+        ``match.lastgroup`` looks up that pattern in the returned mapping.
+        
+        Args:
+            regulation: Regulation the patterns must apply to
+            source: 'regex' (standard + merged), 'fast' (first 15 standard patterns)
+                or 'regulatory' (regex patterns from the regulatory CSV data)
+        """
+        key = (source, regulation)
+        cached = self._combined_regex.get(key)
+        if cached is not None:
+            return cached
+        
+        if source == 'regulatory':
+            candidates = [pattern for patterns in self.regulatory_patterns.values()
+                          for pattern in patterns if pattern.pattern_type == "regex"]
+        elif source == 'fast':
+            candidates = self.regex_patterns[:15]
+        else:
+            candidates = self.regex_patterns
+        
+        alternatives = []
+        by_group: Dict[str, SensitivityPattern] = {}
+        for pattern in candidates:
+            if regulation not in pattern.applicable_regulations:
+                continue
+            group = f"g{len(by_group)}"
+            try:
+                # Validate each pattern on its own; invalid ones were always skipped
+                re.compile(f"(?P<{group}>{pattern.pattern_value})")
+            except re.error:
+                continue
+            alternatives.append(f"(?P<{group}>{pattern.pattern_value})")
+            by_group[group] = pattern
+        
+        combined = re.compile('|'.join(alternatives), re.IGNORECASE) if alternatives else None
+        self._combined_regex[key] = (combined, by_group)
+        return combined, by_group
+    
     def _initialize_context_patterns(self):
         """Initialize context-based patterns"""
         # Context keywords that indicate sensitive data
@@ -599,18 +915,37 @@ class InHouseClassificationEngine:
             table_context: The table context for the field
             **kwargs: Additional parameters
         
+        Returns:
+            tuple: (pattern, confidence) for backend compatibility or None for non-PII
+        """
+        # Convert field name to lowercase for matching
+        if isinstance(field_name, str):
+            field_name = field_name.lower().strip()
+        else:
+            field_name = str(field_name).lower().strip()
+        
+        return self.classify_normalized_field(field_name, regulation=regulation,
+                                              table_context=table_context, **kwargs)
+
+    def classify_normalized_field(self, field_name, regulation=None, table_context=None, **kwargs):
+        """
+        Classify a field name that is already lowercased and stripped
+        
+        Same as classify_field without the per-call normalization, for callers
+        that normalize a batch of names once up front.
+        
+        Args:
+            field_name (str): Normalized field name
+            regulation: The regulation (str or Regulation enum)
+            table_context: The table context for the field
+            **kwargs: Additional parameters
+        
         Returns:
             tuple: (pattern, confidence) for backend compatibility or None for non-PII
         """
         try:
             # Use provided table_context parameter directly
             
-            # Convert field name to lowercase for matching
-            if isinstance(field_name, str):
-                field_name = field_name.lower().strip()
-            else:
-                field_name = str(field_name).lower().strip()
-            
             # Handle regulation parameter conversion
             if isinstance(regulation, str):
                 if regulation.upper() == "GDPR":
@@ -710,6 +1045,65 @@ class InHouseClassificationEngine:
             )
             return (fallback_pattern, 0.05)
 
+    def classify_fields(self, field_names, regulation=None, table_context=None,
+                        max_workers=None, **kwargs):
+        """
+        Classify a batch of database fields in one call
+        
+        Names that normalize to the same value (case and surrounding whitespace)
+        are classified once and share the result.
+        
+        Args:
+            field_names: Iterable of field names to classify
+            regulation: The regulation (str or Regulation enum)
+            table_context: The table context for the fields
+            max_workers: Thread pool size; None or 1 classifies sequentially
+            **kwargs: Additional parameters passed to classify_field
+        
+        Returns:
+            dict: field name -> (pattern, confidence) as returned by classify_field
+        """
+        return dict(self.classify_stream(field_names, regulation=regulation, table_context=table_context,
+                                         max_workers=max_workers, **kwargs))
+
+    def classify_stream(self, field_names, regulation=None, table_context=None,
+                        max_workers=None, **kwargs):
+        """
+        Classify a batch of database fields, yielding results as they become available
+        
+        Yields (field_name, (pattern, confidence)) in input order. Each distinct
+        normalized (interned) name is classified once; classify_field keeps no state, so the
+        distinct names can be spread over a thread pool.
+        
+        Args:
+            field_names: Iterable of field names to classify
+            regulation: The regulation (str or Regulation enum)
+            table_context: The table context for the fields
+            max_workers: Thread pool size; None or 1 classifies sequentially
+            **kwargs: Additional parameters passed to classify_field
+        """
+        field_names = list(field_names)
+        # Interned keys make the dedup lookups below identity-fast for repeated names
+        normalized = [sys.intern(str(field_name).lower().strip()) for field_name in field_names]
+        distinct = list(dict.fromkeys(normalized))
+        
+        def classify(name):
+            return self.classify_normalized_field(name, regulation=regulation, table_context=table_context, **kwargs)
+        
+        def in_input_order(results):
+            # results follow first-occurrence order of distinct, so each new name is the next result
+            by_normalized = {}
+            for field_name, name in zip(field_names, normalized):
+                if name not in by_normalized:
+                    by_normalized[name] = next(results)
+                yield field_name, by_normalized[name]
+        
+        if max_workers and max_workers > 1 and len(distinct) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                yield from in_input_order(executor.map(classify, distinct))
+        else:
+            yield from in_input_order(map(classify, distinct))
+
     def classify_field_hybrid_ai(self, field_name, regulation=None, table_context=None, ai_service=None, **kwargs):
         """
         Advanced hybrid classification combining GenAI + Local Patterns
@@ -1618,13 +2012,11 @@ class InHouseClassificationEngine:
     
     def _fast_regex_match(self, field_name: str, regulation: Regulation) -> Optional[Tuple[SensitivityPattern, float]]:
         """Fast regex matching with regulation filtering"""
-        for pattern in self.pattern_library.regex_patterns[:15]:  # Limit for speed
-            if regulation in pattern.applicable_regulations:
-                try:
-                    if re.match(pattern.pattern_value, field_name, re.IGNORECASE):
-                        return (pattern, pattern.confidence)
-                except re.error:
-                    continue
+        combined, by_group = self.pattern_library.get_combined_regex(regulation, 'fast')  # Limit for speed
+        match = combined.match(field_name) if combined else None
+        if match:
+            pattern = by_group[match.lastgroup]
+            return (pattern, pattern.confidence)
         
         return None
     
@@ -1751,16 +2143,12 @@ class InHouseClassificationEngine:
     
     def _enhanced_regex_match(self, field_name: str, regulation: Regulation) -> Optional[Tuple[SensitivityPattern, float]]:
         """Enhanced regex pattern matching with regulatory patterns"""
-        # Check regulatory regex patterns first
-        for reg_field_name, patterns in self.pattern_library.regulatory_patterns.items():
-            for pattern in patterns:
-                if pattern.pattern_type == "regex" and regulation in pattern.applicable_regulations:
-                    try:
-                        if re.match(pattern.pattern_value, field_name, re.IGNORECASE):
-                            return (pattern, pattern.confidence)
-                    except re.error:
-                        # Skip invalid regex patterns
-                        continue
+        # Check regulatory regex patterns first (invalid regexes are skipped)
+        combined, by_group = self.pattern_library.get_combined_regex(regulation, 'regulatory')
+        match = combined.match(field_name) if combined else None
+        if match:
+            pattern = by_group[match.lastgroup]
+            return (pattern, pattern.confidence)
         
         # Fallback to standard regex matching
         return self._regex_pattern_match(field_name, regulation)
@@ -1856,10 +2244,11 @@ class InHouseClassificationEngine:
     
     def _regex_pattern_match(self, field_name: str, regulation: Regulation) -> Optional[Tuple[SensitivityPattern, float]]:
         """Regex pattern matching"""
-        for pattern in self.pattern_library.regex_patterns:
-            if regulation in pattern.applicable_regulations:
-                if re.match(pattern.pattern_value, field_name, re.IGNORECASE):
-                    return (pattern, pattern.confidence)
+        combined, by_group = self.pattern_library.get_combined_regex(regulation)
+        match = combined.match(field_name) if combined else None
+        if match:
+            pattern = by_group[match.lastgroup]
+            return (pattern, pattern.confidence)
         
         return None
     
@@ -2038,31 +2427,8 @@ class InHouseClassificationEngine:
         """
         field_name = field_name.lower().strip()
         
-        # Only extremely technical/system fields that are definitely not PII
-        highly_technical_patterns = [
-            # Database internal fields only
-            'uuid', 'guid', 'pk', 'fk', 'primary_key', 'foreign_key',
-            'created_at', 'updated_at', 'deleted_at', 'modified_at',
-            'created_by_id', 'updated_by_id', 'modified_by_id', 
-            'version_number', 'revision_number', 'sequence_number',
-            'row_number', 'auto_increment', 'identity_column',
-            
-            # System metadata only
-            'checksum', 'hash_value', 'md5_hash', 'sha1_hash', 'signature_hash',
-            'api_key', 'access_token', 'refresh_token', 'csrf_token', 'session_token',
-            'mime_type', 'content_type', 'file_size', 'encoding_type',
-            
-            # Clear technical identifiers
-            'request_id', 'job_id', 'batch_id', 'log_id', 'audit_id',
-            'trace_id', 'debug_id', 'error_code', 'warning_code',
-            
-            # File system fields only
-            'filename_only', 'file_extension', 'file_path', 'directory_path',
-            'file_size_bytes', 'last_modified_time'
-        ]
-        
         # Only check for exact matches of highly technical fields
-        return field_name in highly_technical_patterns
+        return field_name in _TECHNICAL_FIELD_NAMES
 
     def _check_high_confidence_pii_patterns(self, field_name: str) -> Optional[Tuple[SensitivityPattern, float]]:
         """
@@ -2196,16 +2562,6 @@ class InHouseClassificationEngine:
             'passport_number': (PIIType.ID, RiskLevel.HIGH, 0.95),
         }
         
-        # Check for partial matches with common prefixes/suffixes
-        partial_patterns = {
-            # Patterns that contain these substrings
-            'email': (PIIType.EMAIL, RiskLevel.HIGH, 0.92),
-            'phone': (PIIType.PHONE, RiskLevel.HIGH, 0.90),
-            'address': (PIIType.ADDRESS, RiskLevel.HIGH, 0.88),
-            'name': (PIIType.NAME, RiskLevel.HIGH, 0.85),
-            'password': (PIIType.OTHER, RiskLevel.HIGH, 0.90),
-        }
-        
         # Check exact match first
         if field_name in high_confidence_patterns:
             pii_type, risk_level, confidence = high_confidence_patterns[field_name]
@@ -2242,20 +2598,21 @@ class InHouseClassificationEngine:
             return (pattern, adjusted_confidence)
         
         # Check partial matches for common PII indicators
-        for pattern_key, (pii_type, risk_level, confidence) in partial_patterns.items():
-            if pattern_key in field_name:
-                pattern = SensitivityPattern(
-                    pattern_id=f"partial_match_{pattern_key}",
-                    pattern_name=f"Partial PII match: {pattern_key}",
-                    pattern_type="fuzzy",
-                    pattern_value=field_name,
-                    pii_type=pii_type,
-                    risk_level=risk_level,
-                    applicable_regulations=[Regulation.GDPR],
-                    confidence=confidence,
-                    aliases=[field_name]
-                )
-                return (pattern, confidence)
+        pattern_key = _first_keyword(_PARTIAL_KEYWORD_SCAN, _PARTIAL_KEYWORD_RANK, field_name)
+        if pattern_key is not None:
+            pii_type, risk_level, confidence = _PARTIAL_PII_PATTERNS[pattern_key]
+            pattern = SensitivityPattern(
+                pattern_id=f"partial_match_{pattern_key}",
+                pattern_name=f"Partial PII match: {pattern_key}",
+                pattern_type="fuzzy",
+                pattern_value=field_name,
+                pii_type=pii_type,
+                risk_level=risk_level,
+                applicable_regulations=[Regulation.GDPR],
+                confidence=confidence,
+                aliases=[field_name]
+            )
+            return (pattern, confidence)
         
         return None
 
@@ -2264,239 +2621,31 @@ class InHouseClassificationEngine:
         Check for medium confidence patterns (60-85% confidence)
         These are fields that are likely to contain personal or business sensitive data
         """
-        medium_patterns = {
-            # Employee and HR related (70-75% confidence)
-            'employee': (PIIType.OTHER, RiskLevel.MEDIUM, 0.75),
-            'staff': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
-            'worker': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
-            'hire': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
-            'salary': (PIIType.FINANCIAL, RiskLevel.HIGH, 0.80),
-            'wage': (PIIType.FINANCIAL, RiskLevel.HIGH, 0.80),
-            'compensation': (PIIType.FINANCIAL, RiskLevel.HIGH, 0.85),
-            'bonus': (PIIType.FINANCIAL, RiskLevel.HIGH, 0.80),
-            'commission': (PIIType.FINANCIAL, RiskLevel.HIGH, 0.80),
-            'manager': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
-            'supervisor': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
-            'department': (PIIType.OTHER, RiskLevel.MEDIUM, 0.60),
-            'job': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
-            'position': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
-            'role': (PIIType.OTHER, RiskLevel.MEDIUM, 0.60),
-            'title': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
-            'designation': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
-            'level': (PIIType.OTHER, RiskLevel.MEDIUM, 0.55),
-            'grade': (PIIType.OTHER, RiskLevel.MEDIUM, 0.60),
-            'rank': (PIIType.OTHER, RiskLevel.MEDIUM, 0.60),
-            'badge': (PIIType.ID, RiskLevel.MEDIUM, 0.70),
-            
-            # Company and business (60-75% confidence)
-            'company': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
-            'organization': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
-            'business': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
-            'client': (PIIType.OTHER, RiskLevel.MEDIUM, 0.75),
-            'customer': (PIIType.OTHER, RiskLevel.MEDIUM, 0.75),
-            'vendor': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
-            'supplier': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
-            'partner': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
-            'agency': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
-            'firm': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
-            'corp': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
-            'enterprise': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
-            
-            # Financial and transaction (75-85% confidence)
-            'account': (PIIType.FINANCIAL, RiskLevel.HIGH, 0.85),
-            'transaction': (PIIType.FINANCIAL, RiskLevel.HIGH, 0.80),
-            'invoice': (PIIType.FINANCIAL, RiskLevel.MEDIUM, 0.75),
-            'payment': (PIIType.FINANCIAL, RiskLevel.HIGH, 0.85),
-            'billing': (PIIType.FINANCIAL, RiskLevel.HIGH, 0.85),
-            'purchase': (PIIType.FINANCIAL, RiskLevel.MEDIUM, 0.75),
-            'order': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
-            'receipt': (PIIType.FINANCIAL, RiskLevel.MEDIUM, 0.75),
-            'contract': (PIIType.OTHER, RiskLevel.MEDIUM, 0.75),
-            'agreement': (PIIType.OTHER, RiskLevel.MEDIUM, 0.75),
-            'deal': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
-            'opportunity': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
-            'quote': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
-            'estimate': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
-            'cost': (PIIType.FINANCIAL, RiskLevel.MEDIUM, 0.70),
-            'price': (PIIType.FINANCIAL, RiskLevel.MEDIUM, 0.70),
-            'amount': (PIIType.FINANCIAL, RiskLevel.MEDIUM, 0.65),
-            'value': (PIIType.OTHER, RiskLevel.MEDIUM, 0.55),
-            'fee': (PIIType.FINANCIAL, RiskLevel.MEDIUM, 0.70),
-            'rate': (PIIType.FINANCIAL, RiskLevel.MEDIUM, 0.70),
-            'discount': (PIIType.FINANCIAL, RiskLevel.MEDIUM, 0.70),
-            'tax': (PIIType.FINANCIAL, RiskLevel.MEDIUM, 0.75),
-            'total': (PIIType.FINANCIAL, RiskLevel.MEDIUM, 0.60),
-            'subtotal': (PIIType.FINANCIAL, RiskLevel.MEDIUM, 0.65),
-            'balance': (PIIType.FINANCIAL, RiskLevel.MEDIUM, 0.75),
-            'credit': (PIIType.FINANCIAL, RiskLevel.MEDIUM, 0.75),
-            'debit': (PIIType.FINANCIAL, RiskLevel.MEDIUM, 0.75),
-            
-            # Authentication and security (80-85% confidence)
-            'login': (PIIType.ID, RiskLevel.HIGH, 0.85),
-            'auth': (PIIType.ID, RiskLevel.HIGH, 0.85),
-            'token': (PIIType.ID, RiskLevel.HIGH, 0.80),
-            'session': (PIIType.ID, RiskLevel.HIGH, 0.80),
-            'credential': (PIIType.ID, RiskLevel.HIGH, 0.85),
-            'key': (PIIType.ID, RiskLevel.MEDIUM, 0.60),  # Could be technical
-            'secret': (PIIType.ID, RiskLevel.HIGH, 0.85),
-            'permission': (PIIType.OTHER, RiskLevel.MEDIUM, 0.60),
-            'access': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
-            'privilege': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
-            'grant': (PIIType.OTHER, RiskLevel.MEDIUM, 0.60),
-            
-            # Location related (70-80% confidence)
-            'location': (PIIType.ADDRESS, RiskLevel.MEDIUM, 0.75),
-            'place': (PIIType.ADDRESS, RiskLevel.MEDIUM, 0.70),
-            'region': (PIIType.ADDRESS, RiskLevel.MEDIUM, 0.70),
-            'territory': (PIIType.ADDRESS, RiskLevel.MEDIUM, 0.70),
-            'area': (PIIType.ADDRESS, RiskLevel.MEDIUM, 0.65),
-            'zone': (PIIType.ADDRESS, RiskLevel.MEDIUM, 0.65),
-            'district': (PIIType.ADDRESS, RiskLevel.MEDIUM, 0.70),
-            'county': (PIIType.ADDRESS, RiskLevel.MEDIUM, 0.75),
-            'province': (PIIType.ADDRESS, RiskLevel.MEDIUM, 0.75),
-            'country': (PIIType.ADDRESS, RiskLevel.MEDIUM, 0.80),
-            'nation': (PIIType.ADDRESS, RiskLevel.MEDIUM, 0.75),
-            'continent': (PIIType.ADDRESS, RiskLevel.MEDIUM, 0.70),
-            'latitude': (PIIType.ADDRESS, RiskLevel.HIGH, 0.90),
-            'longitude': (PIIType.ADDRESS, RiskLevel.HIGH, 0.90),
-            'coordinate': (PIIType.ADDRESS, RiskLevel.HIGH, 0.85),
-            'geo': (PIIType.ADDRESS, RiskLevel.MEDIUM, 0.75),
-            'timezone': (PIIType.ADDRESS, RiskLevel.MEDIUM, 0.70),
-            'locale': (PIIType.ADDRESS, RiskLevel.MEDIUM, 0.65),
-            
-            # Project and work related (60-70% confidence)
-            'project': (PIIType.OTHER, RiskLevel.LOW, 0.60),
-            'task': (PIIType.OTHER, RiskLevel.LOW, 0.55),
-            'activity': (PIIType.OTHER, RiskLevel.LOW, 0.55),
-            'assignment': (PIIType.OTHER, RiskLevel.LOW, 0.60),
-            'milestone': (PIIType.OTHER, RiskLevel.LOW, 0.55),
-            'deadline': (PIIType.OTHER, RiskLevel.LOW, 0.55),
-            'schedule': (PIIType.OTHER, RiskLevel.LOW, 0.60),
-            'plan': (PIIType.OTHER, RiskLevel.LOW, 0.55),
-            'timeline': (PIIType.OTHER, RiskLevel.LOW, 0.55),
-            'phase': (PIIType.OTHER, RiskLevel.LOW, 0.55),
-            'stage': (PIIType.OTHER, RiskLevel.LOW, 0.55),
-            'step': (PIIType.OTHER, RiskLevel.LOW, 0.55),
-            'sprint': (PIIType.OTHER, RiskLevel.LOW, 0.60),
-            'iteration': (PIIType.OTHER, RiskLevel.LOW, 0.55),
-            'release': (PIIType.OTHER, RiskLevel.LOW, 0.55),
-            'version': (PIIType.OTHER, RiskLevel.LOW, 0.50),
-            
-            # Communication related (65-75% confidence)
-            'message': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
-            'comment': (PIIType.OTHER, RiskLevel.MEDIUM, 0.60),
-            'note': (PIIType.OTHER, RiskLevel.MEDIUM, 0.60),
-            'remark': (PIIType.OTHER, RiskLevel.MEDIUM, 0.60),
-            'feedback': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
-            'review': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
-            'rating': (PIIType.OTHER, RiskLevel.MEDIUM, 0.60),
-            'score': (PIIType.OTHER, RiskLevel.MEDIUM, 0.60),
-            'evaluation': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
-            'assessment': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
-            'survey': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
-            'poll': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
-            'questionnaire': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
-            'response': (PIIType.OTHER, RiskLevel.MEDIUM, 0.60),
-            'answer': (PIIType.OTHER, RiskLevel.MEDIUM, 0.60),
-            
-            # Personal and demographic (70-85% confidence)
-            'age': (PIIType.OTHER, RiskLevel.MEDIUM, 0.80),
-            'gender': (PIIType.OTHER, RiskLevel.MEDIUM, 0.75),
-            'sex': (PIIType.OTHER, RiskLevel.MEDIUM, 0.75),
-            'race': (PIIType.OTHER, RiskLevel.MEDIUM, 0.80),
-            'ethnicity': (PIIType.OTHER, RiskLevel.MEDIUM, 0.80),
-            'nationality': (PIIType.OTHER, RiskLevel.MEDIUM, 0.75),
-            'citizenship': (PIIType.OTHER, RiskLevel.MEDIUM, 0.80),
-            'marital': (PIIType.OTHER, RiskLevel.MEDIUM, 0.75),
-            'marriage': (PIIType.OTHER, RiskLevel.MEDIUM, 0.75),
-            'family': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
-            'relationship': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
-            'spouse': (PIIType.NAME, RiskLevel.MEDIUM, 0.80),
-            'partner': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),  # Also business context
-            'parent': (PIIType.NAME, RiskLevel.MEDIUM, 0.75),
-            'child': (PIIType.NAME, RiskLevel.MEDIUM, 0.75),
-            'children': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
-            'dependent': (PIIType.OTHER, RiskLevel.MEDIUM, 0.75),
-            'beneficiary': (PIIType.NAME, RiskLevel.MEDIUM, 0.80),
-            'emergency': (PIIType.NAME, RiskLevel.HIGH, 0.85),
-            'contact': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
-            'next_of_kin': (PIIType.NAME, RiskLevel.HIGH, 0.85),
-            
-            # Education and qualification (65-75% confidence)
-            'education': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
-            'school': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
-            'university': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
-            'college': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
-            'degree': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
-            'diploma': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
-            'certificate': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
-            'qualification': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
-            'skill': (PIIType.OTHER, RiskLevel.MEDIUM, 0.60),
-            'expertise': (PIIType.OTHER, RiskLevel.MEDIUM, 0.60),
-            'experience': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
-            'training': (PIIType.OTHER, RiskLevel.MEDIUM, 0.60),
-            'course': (PIIType.OTHER, RiskLevel.MEDIUM, 0.60),
-            'class': (PIIType.OTHER, RiskLevel.MEDIUM, 0.55),
-            'grade': (PIIType.OTHER, RiskLevel.MEDIUM, 0.60),
-            'gpa': (PIIType.OTHER, RiskLevel.MEDIUM, 0.75),
-            
-            # Health and medical (75-85% confidence) - not PHI but personal
-            'health': (PIIType.MEDICAL, RiskLevel.MEDIUM, 0.80),
-            'medical': (PIIType.MEDICAL, RiskLevel.HIGH, 0.85),
-            'insurance': (PIIType.ID, RiskLevel.MEDIUM, 0.80),
-            'policy': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
-            'claim': (PIIType.OTHER, RiskLevel.MEDIUM, 0.75),
-            'coverage': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
-            'benefit': (PIIType.OTHER, RiskLevel.MEDIUM, 0.70),
-            'premium': (PIIType.FINANCIAL, RiskLevel.MEDIUM, 0.75),
-            'deductible': (PIIType.FINANCIAL, RiskLevel.MEDIUM, 0.75),
-            'copay': (PIIType.FINANCIAL, RiskLevel.MEDIUM, 0.75),
-            
-            # Names and identifiers with fuzzy matching (70-85% confidence)
-            'name': (PIIType.NAME, RiskLevel.MEDIUM, 0.75),
-            'identifier': (PIIType.ID, RiskLevel.MEDIUM, 0.70),
-            'code': (PIIType.OTHER, RiskLevel.LOW, 0.45),
-            'number': (PIIType.OTHER, RiskLevel.MEDIUM, 0.60),
-            'label': (PIIType.OTHER, RiskLevel.LOW, 0.40),
-            'tag': (PIIType.OTHER, RiskLevel.LOW, 0.45),
-            
-            # Technical but potentially personal (50-65% confidence)
-            'preference': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
-            'setting': (PIIType.OTHER, RiskLevel.LOW, 0.50),
-            'config': (PIIType.OTHER, RiskLevel.LOW, 0.45),
-            'option': (PIIType.OTHER, RiskLevel.LOW, 0.50),
-            'choice': (PIIType.OTHER, RiskLevel.LOW, 0.50),
-            'selection': (PIIType.OTHER, RiskLevel.LOW, 0.50),
-            'language': (PIIType.OTHER, RiskLevel.MEDIUM, 0.65),
-            'locale': (PIIType.ADDRESS, RiskLevel.MEDIUM, 0.65),
-            'theme': (PIIType.OTHER, RiskLevel.LOW, 0.45),
-            'style': (PIIType.OTHER, RiskLevel.LOW, 0.45),
-            'format': (PIIType.OTHER, RiskLevel.LOW, 0.45),
-        }
         
-        # Check medium confidence patterns - exact match first
-        for pattern_key, (pii_type, risk_level, confidence) in medium_patterns.items():
-            if pattern_key in field_name.lower():
-                # Apply regulation based on confidence level and PII type
-                regulations = []
-                if confidence >= 0.60:
-                    regulations.append(Regulation.GDPR)
-                if confidence >= 0.80 and pii_type in [PIIType.FINANCIAL, PIIType.ID, PIIType.NAME, PIIType.MEDICAL]:
-                    # High-confidence sensitive data may need HIPAA in healthcare context
-                    regulations.append(Regulation.HIPAA)
-                
-                pattern = SensitivityPattern(
-                    pattern_id=f"medium_{pattern_key}",
-                    pattern_name=f"Medium confidence: {pattern_key}",
-                    pattern_type="fuzzy",
-                    pattern_value=field_name,
-                    pii_type=pii_type,
-                    risk_level=risk_level,
-                    applicable_regulations=regulations,
-                    confidence=confidence,
-                    aliases=[field_name]
-                )
-                return (pattern, confidence)
+        # Single scan for every keyword; the earliest-declared hit wins
+        pattern_key = _first_keyword(_MEDIUM_KEYWORD_SCAN, _MEDIUM_KEYWORD_RANK, field_name.lower())
+        if pattern_key is not None:
+            pii_type, risk_level, confidence = _MEDIUM_CONFIDENCE_PATTERNS[pattern_key]
+            # Apply regulation based on confidence level and PII type
+            regulations = []
+            if confidence >= 0.60:
+                regulations.append(Regulation.GDPR)
+            if confidence >= 0.80 and pii_type in [PIIType.FINANCIAL, PIIType.ID, PIIType.NAME, PIIType.MEDICAL]:
+                # High-confidence sensitive data may need HIPAA in healthcare context
+                regulations.append(Regulation.HIPAA)
+            
+            pattern = SensitivityPattern(
+                pattern_id=f"medium_{pattern_key}",
+                pattern_name=f"Medium confidence: {pattern_key}",
+                pattern_type="fuzzy",
+                pattern_value=field_name,
+                pii_type=pii_type,
+                risk_level=risk_level,
+                applicable_regulations=regulations,
+                confidence=confidence,
+                aliases=[field_name]
+            )
+            return (pattern, confidence)
         
         return None
 
@@ -12,8 +12,17 @@ from pathlib import Path
 from dataclasses import dataclass, asdict
 from contextlib import contextmanager
 import threading
+from operator import itemgetter
 from fuzzywuzzy import fuzz
 
+try:
+    # Batched C++ similarity scoring. rapidfuzz's ratio is the normalized Indel (LCS) similarity,
+    # the same as fuzzywuzzy's when python-Levenshtein is installed; fuzzywuzzy without it falls
+    # back to difflib's SequenceMatcher, which can score some pairs differently
+    from rapidfuzz import process as rapidfuzz_process, fuzz as rapidfuzz_fuzz
+except ImportError:
+    rapidfuzz_process = None
+
 from pii_scanner_poc.models.data_models import Regulation, PIIType, RiskLevel
 from pii_scanner_poc.models.enhanced_data_models import SensitivityPattern, CompanyAlias, DetectionMethod
 
@@ -65,6 +74,13 @@ class LearningRecord:
 class LocalAliasDatabase:
     """Advanced local database for alias and pattern management"""
     
+    # Columns of field_aliases that export_alias_columns may select
+    ALIAS_COLUMNS = frozenset({
+        'alias_id', 'standard_field_name', 'alias_name', 'confidence_score', 'pii_type',
+        'risk_level', 'applicable_regulations', 'company_id', 'region', 'created_date',
+        'last_used', 'usage_count', 'validation_status', 'created_by'
+    })
+    
     def __init__(self, db_path: str = "data/alias_database.db"):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(exist_ok=True)
@@ -251,12 +267,28 @@ class LocalAliasDatabase:
                     AND validation_status = 'approved'
                 """, (company_id, region))
                 
-                for row in cursor.fetchall():
-                    alias_data = dict(row)
-                    similarity = fuzz.ratio(field_name.lower(), alias_data['alias_name'].lower()) / 100.0
+                rows = cursor.fetchall()
+                target = field_name.lower()
+                
+                if rapidfuzz_process is not None:
+                    # Score every candidate in one call; rows below the threshold are dropped in C++.
+                    # extract returns best-first, so restore database order before building matches
+                    extracted = rapidfuzz_process.extract(
+                        target,
+                        [row['alias_name'].lower() for row in rows],
+                        scorer=rapidfuzz_fuzz.ratio,
+                        score_cutoff=similarity_threshold * 100,
+                        limit=None
+                    )
+                    scored = ((rows[index], score) for _, score, index in sorted(extracted, key=itemgetter(2)))
+                else:
+                    scored = ((row, fuzz.ratio(target, row['alias_name'].lower())) for row in rows)
+                
+                for row, score in scored:
+                    similarity = score / 100.0
                     
                     if similarity >= similarity_threshold:
-                        alias = self._row_to_field_alias(alias_data)
+                        alias = self._row_to_field_alias(dict(row))
                         alias.confidence_score *= similarity  # Adjust confidence based on similarity
                         matches.append(alias)
         
@@ -529,6 +561,28 @@ class LocalAliasDatabase:
             
             return aliases
     
+    def export_alias_columns(self, columns: Tuple[str, ...], company_id: str = None,
+                             validation_status: str = "approved") -> Dict[str, List[Any]]:
+        """Export selected alias columns as parallel lists, one list per column"""
+        
+        unknown = set(columns) - self.ALIAS_COLUMNS
+        if unknown:
+            raise ValueError(f"Unknown alias columns: {', '.join(sorted(unknown))}")
+        
+        with self._get_connection() as conn:
+            query = f"SELECT {', '.join(columns)} FROM field_aliases WHERE validation_status = ?"
+            params = [validation_status]
+            
+            if company_id:
+                query += " AND (company_id = ? OR company_id IS NULL)"
+                params.append(company_id)
+            
+            rows = conn.execute(query, params).fetchall()
+        
+        if not rows:
+            return {column: [] for column in columns}
+        return dict(zip(columns, map(list, zip(*rows))))
+    
     def approve_pending_aliases(self, approver: str, alias_ids: List[str] = None) -> int:
         """Approve pending aliases"""
         
@@ -221,6 +221,57 @@ def test_mcp_alias_tools():
     return True
 
 
+def test_cli_alias_ids_match_csv_import():
+    """Test that add-alias and import-csv derive the same alias ID for the same alias"""
+    print("\n🧪 Testing CLI and CSV Import Alias IDs")
+    print("-" * 50)
+    
+    try:
+        import csv
+        import tempfile
+        from types import SimpleNamespace
+        from pii_scanner_poc.cli.alias_management import AliasManagementCLI
+        from pii_scanner_poc.services.local_alias_database import LocalAliasDatabase
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db = LocalAliasDatabase(str(Path(tmp_dir) / "alias_ids.db"))
+            stored_ids = []
+            add_field_alias = db.add_field_alias
+            
+            def record_alias(alias):
+                stored_ids.append(alias.alias_id)
+                return add_field_alias(alias)
+            
+            db.add_field_alias = record_alias
+            cli = AliasManagementCLI()
+            cli._db = db
+            
+            # Enum name on the command line, enum name in the CSV as well
+            cli.add_alias(SimpleNamespace(
+                field_name="cust_email", pii_type="EMAIL", risk_level=None, confidence=None,
+                regulations=None, company=None, region=None, status=None, created_by=None
+            ))
+            
+            csv_path = Path(tmp_dir) / "aliases.csv"
+            with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(['alias_name', 'pii_type'])
+                writer.writerow(['cust_email', 'EMAIL'])
+            
+            cli.import_csv(SimpleNamespace(file=str(csv_path), company=None, created_by=None, no_parallel=True))
+        
+        if len(stored_ids) == 2 and stored_ids[0] == stored_ids[1]:
+            print(f"✅ add-alias and import-csv share alias ID {stored_ids[0]}")
+            return True
+        
+        print(f"❌ Alias IDs differ: {stored_ids}")
+        return False
+        
+    except Exception as e:
+        print(f"❌ Alias ID test failed: {e}")
+        return False
+
+
 def main():
     """Run all integration tests"""
     print("🚀 ALIAS MANAGEMENT INTEGRATION TEST SUITE")
@@ -233,6 +284,7 @@ def main():
     test_results.append(("Classifier Integration", test_alias_classifier_integration()))
     test_results.append(("Hybrid Orchestrator", test_hybrid_orchestrator_integration()))
     test_results.append(("MCP Tools", test_mcp_alias_tools()))
+    test_results.append(("CLI/CSV Alias IDs", test_cli_alias_ids_match_csv_import()))
     
     # Summary
     print("\n📊 TEST RESULTS SUMMARY")